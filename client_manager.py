@@ -1,11 +1,10 @@
 import os
-from google import genai
 from dotenv import load_dotenv
 
-load_dotenv()
-
 class ClientManager:
     def __init__(self):
+        load_dotenv()
+
         # Load keys from environment variables
         # We look for GOOGLE_API_KEY and any GOOGLE_API_KEY_BACKUP* variables
         self.keys = []
@@ -28,9 +27,19 @@ class ClientManager:
             raise ValueError("No GOOGLE_API_KEY found in environment variables.")
             
         self.current_key_index = 0
+        self._current = None
+
+    @property
+    def current(self):
+        """The cached genai.Client for the active key (built on first use)."""
+        if self._current is None:
+            self._current = self._build_client()
+        return self._current
+
+    def _build_client(self):
+        """Builds a genai.Client for the current key."""
+        from google import genai
 
-    def get_client(self):
-        """Returns a genai.Client initialized with the current key."""
         if not self.keys:
             raise ValueError("No API keys available.")
         
@@ -38,12 +47,17 @@ class ClientManager:
         # print(f"[Debug] Using API Key index: {self.current_key_index}")
         return genai.Client(api_key=current_key)
 
+    def get_client(self):
+        """Returns the cached genai.Client for the current key."""
+        return self.current
+
     def rotate_client(self):
-        """Switches to the next available API key and returns a new client."""
+        """Switches to the next available API key and returns the new client."""
         if len(self.keys) <= 1:
             print("Warning: No backup keys available to rotate to.")
-            return self.get_client()
+            return self.current
             
         self.current_key_index = (self.current_key_index + 1) % len(self.keys)
         print(f"Rotating API Key. Switching to key index: {self.current_key_index}")
-        return self.get_client()
+        self._current = self._build_client()
+        return self._current
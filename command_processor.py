@@ -3,6 +3,22 @@ import re
 from datetime import datetime, timedelta
 from typing import Dict, List, Any
 
+# Cheap pre-filter: only obvious non-commands skip the LLM.
+# Slack mentions/channel links and :emoji: codes carry no instruction on their own.
+MENTION_OR_EMOJI_PATTERN = re.compile(r"<[@#!][^>]*>|:[a-z0-9_+\-']+:", re.IGNORECASE)
+WORD_PATTERN = re.compile(r"[a-z0-9']+")
+# Replies that are acknowledgements whatever order their words come in
+ACKNOWLEDGEMENT_WORDS = frozenset({
+    "ok", "okay", "k", "kk", "thanks", "thx", "ty", "cool", "great", "nice", "awesome",
+    "perfect", "noted", "lol", "haha", "yes", "yep", "yeah", "sure", "np", "ack",
+    "hi", "hey", "hello",
+})
+# Multi-word acknowledgements (their words are too generic to reject one by one)
+ACKNOWLEDGEMENT_PHRASES = frozenset({
+    "thank you", "thank you so much", "thanks a lot", "got it", "sounds good", "will do",
+    "no problem", "all good", "makes sense", "looks good", "good job", "great job", "nice work",
+})
+
 def parse_command_from_message(message_text: str, bot_user_id: str, authorized_user_id: str) -> Dict[str, Any]:
     """
     Parses a Slack message to extract actionable commands.
@@ -230,6 +246,25 @@ def is_reminder_command(message_text: str) -> bool:
             return True
     return False
 
+def looks_like_command(message_text: str) -> bool:
+    """
+    Cheap check for whether a message may contain an instruction or question.
+    Only obvious non-commands are rejected: empty or emoji/mention-only text and
+    short acknowledgements like "thanks" or "ok, got it". Everything else goes on.
+    
+    Args:
+        message_text: The message text to check
+        
+    Returns:
+        True if the message should be sent to the LLM for analysis
+    """
+    words = WORD_PATTERN.findall(MENTION_OR_EMOJI_PATTERN.sub(" ", message_text or "").lower())
+    if not words:
+        return False
+    if all(word in ACKNOWLEDGEMENT_WORDS for word in words):
+        return False
+    return " ".join(word for word in words if word not in ACKNOWLEDGEMENT_WORDS) not in ACKNOWLEDGEMENT_PHRASES
+
 def extract_reminder_details(message_text: str) -> Dict[str, Any]:
     """
     Extracts detailed information from a reminder command.
@@ -11,7 +11,7 @@ from google.genai import types
 # Import existing modules
 from client_manager import ClientManager
 from state_manager import read_context, update_section
-from slack_tools import get_messages_mentions, send_slack_message, schedule_slack_message
+from slack_tools import get_messages_mentions, get_messages_mentions_multi, scan_channels, send_slack_message, schedule_slack_message
 from command_processor import create_reminder_message
 
 # Import new modules
@@ -38,6 +38,9 @@ memory = get_memory_manager()
 # Global variable to store monitored channels
 monitored_channels = []
 
+# The daemon's LLM ClientManager (set in start_daemon), shared by every report job
+client_manager = None
+
 def log(message: str):
     """Writes to the shared log file and stdout."""
     try:
@@ -105,15 +108,16 @@ def check_mentions_job(manager: ClientManager, channel_ids: list):
     all_mentions = []
     search_keywords = ["mohit", "the real pm"]
     
-    for channel_id in channel_ids:
+    # Fetch bot and user mentions for every channel in one concurrent batch
+    results = get_messages_mentions_multi(
+        [dict(channel_id=c, user_id=bot_user_id, days=0.5, include_keywords=search_keywords) for c in channel_ids] +
+        [dict(channel_id=c, user_id=authorized_user_id, days=0.5) for c in channel_ids]
+    )
+    
+    for i, channel_id in enumerate(channel_ids):
         try:
-            # Check bot mentions
-            msgs = get_messages_mentions(channel_id, bot_user_id, days=0.5, include_keywords=search_keywords)
-            # Check user mentions
-            user_msgs = get_messages_mentions(channel_id, authorized_user_id, days=0.5)
-            
-            # Combine
-            joined = msgs + user_msgs
+            # Combine bot and user mentions
+            joined = results[i] + results[len(channel_ids) + i]
             for msg in joined:
                 msg['channel'] = channel_id
                 msg['channel_id'] = channel_id  # Keep both for compatibility
@@ -342,10 +346,8 @@ def check_mentions_job(manager: ClientManager, channel_ids: list):
         NOTE: When creating polls, reminders, or calendar events, DO NOT generate a separate send_message action to confirm. The action itself is the confirmation.
         """
         
-        client = manager.get_client()
-        
         # Use native JSON schema enforcement
-        response = client.models.generate_content(
+        response = manager.current.models.generate_content(
             model="gemini-2.0-flash",
             contents=prompt,
             config=types.GenerateContentConfig(
@@ -512,17 +514,13 @@ def run_proactive_check_job(channel_ids: list):
     
     try:
         context_text = read_context()
-        engine = ProactiveEngine(memory)
+        engine = ProactiveEngine(memory, client_manager=client_manager)
         
         # Collect recent messages for blocker detection
         all_messages = []
         bot_user_id = os.environ.get("SLACK_BOT_USER_ID")
-        for channel_id in channel_ids:
-            try:
-                msgs = get_messages_mentions(channel_id, bot_user_id, days=1)
-                all_messages.extend(msgs)
-            except:
-                pass
+        for msgs in scan_channels(channel_ids, bot_user_id, days=1).values():
+            all_messages.extend(msgs)
         
         # Get proactive suggestions
         suggestions = engine.get_proactive_suggestions(context_text, all_messages)
@@ -604,12 +602,20 @@ def run_weekly_report_job():
     """
     Weekly job to generate and optionally send a status report.
     """
-    engine = ProactiveEngine(memory)
+    engine = ProactiveEngine(memory, client_manager=client_manager)
     
     if not engine.should_send_weekly_report():
         return
     
+    report_key = f"weekly_report_{datetime.now().strftime('%Y-%m-%d')}"
+    
+    # Claim this week's report before the LLM call so overlapping runs don't both pay for generation
+    if not memory.try_mark_report_sent(report_key):
+        log("Weekly report already queued today, skipping.")
+        return
+    
     log("Generating weekly report...")
+    queued = False
     
     try:
         context_text = read_context()
@@ -633,6 +639,7 @@ def run_weekly_report_job():
         current_queue = get_pending_actions()
         current_queue.append(action)
         save_pending_actions(current_queue)
+        queued = True
         
         log("Weekly report queued for approval.")
         
@@ -646,6 +653,12 @@ def run_weekly_report_job():
         
     except Exception as e:
         log(f"Weekly report generation failed: {e}")
+        if not queued:
+            # Let a later run retry instead of skipping this week's report
+            try:
+                memory.release_report_claim(report_key)
+            except Exception as release_error:
+                log(f"Could not release weekly report claim: {release_error}")
 
 def run_daily_status_job(type="morning", channel_id=None):
     """
@@ -671,9 +684,10 @@ def run_daily_status_job(type="morning", channel_id=None):
         return
     
     log(f"Generating daily {type} report for {today_date}...")
+    claimed = False
     try:
         context_text = read_context()
-        engine = ProactiveEngine(memory)
+        engine = ProactiveEngine(memory, client_manager=client_manager)
         
         # Custom prompt based on time of day
         if type == "morning":
@@ -709,17 +723,26 @@ def run_daily_status_job(type="morning", channel_id=None):
             }
         }
         
+        # Mark as sent in memory; losing the race means another run already queued it
+        if not memory.try_mark_report_sent(report_key):
+            log(f"Daily {type} report already sent today ({today_date}), skipping.")
+            return
+        claimed = True
+        
         current_queue = get_pending_actions()
         current_queue.append(action)
         save_pending_actions(current_queue)
-        
-        # Mark as sent in memory
-        memory.mark_report_sent(report_key)
         log(f"Daily {type} report queued for channel {channel_id} and marked as sent for {today_date}.")
 
         
     except Exception as e:
         log(f"Daily {type} report generation failed: {e}")
+        if claimed:
+            # Not queued: release the claim so check_and_send_missed_reports can retry it
+            try:
+                memory.release_report_claim(report_key)
+            except Exception as release_error:
+                log(f"Could not release daily {type} report claim: {release_error}")
 
 def check_and_send_missed_reports():
     """
@@ -1072,9 +1095,22 @@ def execute_approved_actions_job():
         save_pending_actions(queue)
         update_status("IDLE", "Execution cycle complete")
 
+def prune_memory_job():
+    """
+    Daily job to drop old processed-message markers and history rows
+    so the SQLite working set stays in the page cache.
+    """
+    try:
+        deleted = memory.prune()
+        if deleted:
+            log(f"Pruned {deleted} old rows from memory database.")
+    except Exception as e:
+        log(f"Memory prune job failed: {e}")
+
+
 def start_daemon(channel_ids: list):
     """Start the daemon scheduler loop (blocking)"""
-    global monitored_channels
+    global monitored_channels, client_manager
     monitored_channels = channel_ids
     
     try:
@@ -1082,6 +1118,7 @@ def start_daemon(channel_ids: list):
     except Exception as e:
         log(f"Failed to init ClientManager: {e}")
         return
+    client_manager = manager
 
     log("Daemon started. Monitoring channels: " + str(channel_ids))
     log(f"Memory database: {memory.db_path}")
@@ -1105,6 +1142,7 @@ def start_daemon(channel_ids: list):
     schedule.every().day.at("18:00").do(run_daily_status_job, type="evening", channel_id=main_channel)
     
     schedule.every(1).hour.do(cleanup_queue_job)
+    schedule.every().day.at("03:00").do(prune_memory_job)
     
     # Run once immediately
     check_mentions_job(manager, channel_ids)
@@ -1124,6 +1162,7 @@ def start_daemon(channel_ids: list):
     log("   - Evening report: 18:00 Local/IST")
     log("   - Weekly report: Friday 17:00 UTC")
     log("   - Cleanup: Every 1 hour")
+    log("   - Memory prune: Daily 03:00")
     
     while True:
         schedule.run_pending()
@@ -3,32 +3,88 @@ import sys
 import argparse
 import json
 import time
+import hashlib
+import re
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, wait
 from dotenv import load_dotenv
-from google import genai
-from google.genai import types
-
-# Import our custom modules
-from drift_detector import analyze_drift
-from state_manager import update_section, read_context
-from slack_tools import (
-    read_slack_messages, 
-    get_self_todo, 
-    send_slack_message,
-    schedule_slack_message,
-    get_messages_mentions
-)
-from command_processor import parse_command_from_message, create_reminder_message
-from email_tools import read_recent_emails, send_email
+
+# Heavy modules (google-genai, drift detection, email) are imported inside the
+# command functions that use them so trivial commands like `post-intro` start fast.
 from client_manager import ClientManager
 
-# Load environment variables
-load_dotenv()
+# Last-seen Slack/context fingerprint for incremental `sync` runs (kept next to the DB)
+SYNC_STATE_FILE = ".sync_state.json"
+# Messages per channel/to-do list that analyze_drift reads; the fingerprint covers the same window
+SYNC_MESSAGE_WINDOW = 20
+
+# Shared pool for fanning out Slack sends (threads are only started on first submit)
+_SLACK_POOL = ThreadPoolExecutor(max_workers=4)
+
+# Static parts of the process-mentions prompt, joined once per run around
+# the dynamic time/context/messages instead of re-formatting one large f-string.
+MENTIONS_PROMPT_INTRO = """You are The Real PM agent. Analyze these Slack messages where you were mentioned by Mohit.
+
+CRITICAL RULES:
+1. These messages are ONLY from Mohit (authorized user).
+2. All messages are from the LAST 24 HOURS to capture full conversation context.
+3. Your response MUST contain TWO parts: a readable text analysis, and a structured JSON list of actions enclosed in a ```json code block.
+4. CURRENT TIME: """
+
+MENTIONS_PROMPT_RULES = """. DO NOT schedule reminders for times that have already passed.
+5. CHECK "3. Reminders (Managed by Agent)" section in the context below. DO NOT schedule reminders that are already listed there.
+
+Current Project Context:
+"""
+
+MENTIONS_PROMPT_MESSAGES_HEADER = "\n\nMohit's Messages (last 24 hours):\n"
+
+MENTIONS_PROMPT_INSTRUCTIONS = """
+
+FIRST, provide a clear, readable summary of intents found (Reminders, Assignments, Tasks) and the proposed actions.
+
+SECOND, at the end of your response, output ONLY the structured actions in a JSON list.
+
+JSON Schema for EACH action object:
+{
+  "action_type": "schedule_reminder" | "update_context_task" | "send_message" | "draft_reply",
+  "reasoning": "Brief explanation (e.g., 'Remind Umang about beta release')",
+  "data": {
+    "target_channel_id": "Channel ID for Slack actions (use original message channel ID)",
+    "target_user_ids": "List of Slack IDs mentioned or implied (e.g., ['U123456'])",
+    "message_text": "The exact message to send (for send_message or draft_reply action)",
+    "reply_to_message_ts": "Timestamp of the message to reply to (for draft_reply action)",
+    "time_iso": "ISO 8601 format for reminders (e.g., 2025-12-06T11:30:00). Must be future time.",
+    "epic_title": "Epic name from context.md (e.g., Home Page Update)",
+    "new_status": "New Status for the task",
+    "new_owner": "New Owner for the task",
+    "new_markdown_content": "The EXACT full markdown content for Section '2. Active Epics & Tasks' to reflect the update. Maintain existing structure."
+  }
+}
+
+IMPORTANT: 
+- Use "send_message" when you need to proactively notify the team.
+- Use "draft_reply" when someone asked Mohit a question and you need to draft a response for his approval.
+- Check "3. Reminders (Managed by Agent)" to avoid duplicate reminders.
+
+Example JSON Output:
+```json
+[
+  {
+    "action_type": "schedule_reminder",
+    "reasoning": "Remind Mohit to take update from Pravin",
+    "data": {
+      "target_channel_id": "C08JF2UFCR1",
+      "target_user_ids": ["U07FDMFFM5F", "U999888"],
+      "time_iso": "2025-12-06T11:30:00"
+    }
+  }
+]
+```
+"""
 
 def parse_json_response(text: str) -> list:
     """Parse JSON response from schema-enforced generation."""
-    import re
-    import json
-    
     # Try to find JSON block first (for backward compatibility)
     match = re.search(r"```json\s*\n(.*?)\n\s*```", text, re.DOTALL)
     if match:
@@ -44,6 +100,53 @@ def parse_json_response(text: str) -> list:
         print(f"Warning: JSON parsing error: {e}")
         return []
 
+def _sync_fingerprint(channel_ids: list, todo_sync: bool) -> dict:
+    """
+    Cheap snapshot of the messages analyze_drift reads and the context hash.
+    Covers text edits and thread activity, not just newly posted messages.
+    """
+    from slack_tools import read_slack_messages, get_self_todo
+    from state_manager import read_context
+
+    channels = {}
+    for cid in channel_ids or []:
+        messages = read_slack_messages(cid, limit=SYNC_MESSAGE_WINDOW)
+        snapshot = [
+            (m.get('ts'), m.get('text'), (m.get('edited') or {}).get('ts'),
+             m.get('reply_count'), m.get('latest_reply'))
+            for m in messages
+        ]
+        channels[cid] = hashlib.md5(json.dumps(snapshot).encode()).hexdigest()
+    state = {
+        "channels": channels,
+        "context_md5": hashlib.md5(read_context().encode()).hexdigest()
+    }
+    if todo_sync:
+        todos = get_self_todo(limit=SYNC_MESSAGE_WINDOW)
+        state["todo_md5"] = hashlib.md5(json.dumps(todos).encode()).hexdigest()
+    return state
+
+def _sync_state_path() -> str:
+    """Sync state lives alongside the memory DB, not in the working directory."""
+    data_dir = os.environ.get('PERSISTENT_DATA_PATH') or "memory"
+    return os.path.join(data_dir, SYNC_STATE_FILE)
+
+def _load_sync_state() -> dict:
+    try:
+        with open(_sync_state_path(), "r") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+def _save_sync_state(state: dict):
+    path = _sync_state_path()
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(state, f)
+    except OSError as e:
+        print(f"Warning: Could not save sync state: {e}")
+
 def run_sync_mode(manager: ClientManager, channel_ids: list, todo_sync: bool):
     """
     Executes the 'sync' mode: checks for drift and optionally updates context.
@@ -53,25 +156,33 @@ def run_sync_mode(manager: ClientManager, channel_ids: list, todo_sync: bool):
         print("Error: At least one --channels or --todo-sync must be provided.")
         return
 
+    from drift_detector import analyze_drift
+    from state_manager import update_section, read_context
+
     print(f"Analyzing drift between Context and Slack...")
     if channel_ids:
         print(f"Channels: {channel_ids}")
     if todo_sync:
         print("Including To-Do Sync")
     
-    client = manager.get_client()
+    # Skip the LLM call entirely if neither Slack nor the context changed
+    fingerprint = _sync_fingerprint(channel_ids, todo_sync)
+    if fingerprint == _load_sync_state():
+        print("No drift since last run. Context is up to date.")
+        return
+    
     max_retries = len(manager.keys)
     attempts = 0
     
     while attempts < max_retries:
         try:
-            result = analyze_drift(client, channel_ids, todo_sync=todo_sync)
+            result = analyze_drift(manager.current, channel_ids, todo_sync=todo_sync)
             break # Success
         except Exception as e:
             error_str = str(e)
             if "429" in error_str or "RESOURCE_EXHAUSTED" in error_str:
                 print(f"Quota exceeded (Attempt {attempts+1}/{max_retries}). Rotating key...")
-                client = manager.rotate_client()
+                manager.rotate_client()
                 attempts += 1
                 time.sleep(1) # Brief pause
             else:
@@ -86,6 +197,9 @@ def run_sync_mode(manager: ClientManager, channel_ids: list, todo_sync: bool):
     print(f"Risk Level: {result.get('risk_level')}")
     print(f"Reason: {result.get('reason')}")
     
+    # Set when a proposed update is declined or fails, so the next sync offers it again
+    pending_updates = False
+    
     if result.get('status_change_detected'):
         print("\n-----------------------")
         
@@ -101,8 +215,10 @@ def run_sync_mode(manager: ClientManager, channel_ids: list, todo_sync: bool):
                     print("Overall Health & Risk Register updated.")
                 except Exception as e:
                     print(f"Failed to update Overall Health & Risk Register: {e}")
+                    pending_updates = True
             else:
                 print("Skipped Overall Health & Risk Register update.")
+                pending_updates = True
 
         # 2. Active Epics & Tasks Update
         suggested_epics = result.get('suggested_update_to_active_epics_and_tasks')
@@ -116,14 +232,27 @@ def run_sync_mode(manager: ClientManager, channel_ids: list, todo_sync: bool):
                     print("Active Epics & Tasks updated.")
                 except Exception as e:
                     print(f"Failed to update Active Epics & Tasks: {e}")
+                    pending_updates = True
             else:
                 print("Skipped Active Epics & Tasks update.")
+                pending_updates = True
 
     else:
         print("No status change detected. Context is up to date.")
 
+    if pending_updates:
+        return
+    
+    # Record what was analyzed (re-hash the context in case updates were applied)
+    fingerprint["context_md5"] = hashlib.md5(read_context().encode()).hexdigest()
+    _save_sync_state(fingerprint)
+
 def create_chat(client):
     """Helper to create a chat session with tools."""
+    from google.genai import types
+    from slack_tools import read_slack_messages, get_self_todo, send_slack_message
+    from email_tools import read_recent_emails, send_email
+
     # Define the tools
     tools = [
         read_slack_messages,
@@ -160,10 +289,9 @@ def run_chat_mode(manager: ClientManager):
     Executes the 'chat' mode: interactive personal assistant.
     Handles API key rotation on quota errors.
     """
-    client = manager.get_client()
     print("Initializing Personal Assistant...")
     
-    chat = create_chat(client)
+    chat = create_chat(manager.current)
     print("Personal Assistant is ready! (Type 'quit' to exit)")
     
     while True:
@@ -190,11 +318,11 @@ def run_chat_mode(manager: ClientManager):
                     error_str = str(e)
                     if "429" in error_str or "RESOURCE_EXHAUSTED" in error_str:
                         print(f"Quota exceeded (Attempt {attempts+1}/{max_retries}). Rotating key...")
-                        client = manager.rotate_client()
+                        manager.rotate_client()
                         # We need to recreate the chat session with the new client
                         # Note: This loses conversation history in this simple implementation
                         print("Reconnecting session (History may be reset)...")
-                        chat = create_chat(client)
+                        chat = create_chat(manager.current)
                         attempts += 1
                         time.sleep(1)
                     else:
@@ -222,6 +350,12 @@ def run_process_mentions(manager: ClientManager, channel_ids: list):
         print("  SLACK_BOT_USER_ID: The bot's Slack user ID")
         return
 
+    import pytz
+    from google.genai import types
+    from state_manager import update_section, read_context
+    from slack_tools import send_slack_message, schedule_slack_message, get_messages_mentions
+    from command_processor import looks_like_command, create_reminder_message
+
     # Load agent instruction
     try:
         with open("agent_instruction.txt", "r") as f:
@@ -308,89 +442,50 @@ def run_process_mentions(manager: ClientManager, channel_ids: list):
         refusal_message = ("I appreciate the mention, but I only accept commands from my designated "
                           "Project Manager, Mohit. Please reach out to him directly for any requests.")
         
-        for msg in unauthorized_mentions:
-            try:
-                send_slack_message(msg['channel_id'], refusal_message)
-                print(f"  ✓ Sent refusal to channel {msg['channel_id']}")
-            except Exception as e:
-                print(f"  ✗ Failed to send refusal: {e}")
+        # One refusal per channel, sent in parallel
+        refusal_channels = {msg['channel_id'] for msg in unauthorized_mentions}
+        futures = {
+            _SLACK_POOL.submit(send_slack_message, channel, refusal_message): channel
+            for channel in refusal_channels
+        }
+        wait(futures)
+        for future, channel in futures.items():
+            error = future.exception()
+            if error:
+                print(f"  ✗ Failed to send refusal: {error}")
+            else:
+                print(f"  ✓ Sent refusal to channel {channel}")
     
     if not all_mentions:
         print("No mentions from authorized user (Mohit) found in the last 24 hours.")
         return
     
+    # Only escalate messages that look like commands or questions to the LLM
+    all_mentions = [m for m in all_mentions if looks_like_command(m.get('text') or '')]
+    if not all_mentions:
+        print("No actionable mentions from authorized user (Mohit) in the last 24 hours.")
+        return
+    
     print(f"\nFound {len(all_mentions)} authorized mention(s). Analyzing...")
     
     # Prepare context for AI
     context_text = read_context()
-    mentions_text = json.dumps(all_mentions, indent=2, default=str)
+    mentions_text = json.dumps(all_mentions, separators=(',', ':'), default=str)
     
     # Get current time for the LLM
-    from datetime import datetime
-    import pytz
     ist = pytz.timezone('Asia/Kolkata')
     current_time = datetime.now(ist).strftime('%Y-%m-%d %H:%M:%S %Z')
     
-    # New prompt (replace the original):
-    prompt = f"""You are The Real PM agent. Analyze these Slack messages where you were mentioned by Mohit.
-
-CRITICAL RULES:
-1. These messages are ONLY from Mohit (authorized user).
-2. All messages are from the LAST 24 HOURS to capture full conversation context.
-3. Your response MUST contain TWO parts: a readable text analysis, and a structured JSON list of actions enclosed in a ```json code block.
-4. CURRENT TIME: {current_time}. DO NOT schedule reminders for times that have already passed.
-5. CHECK "3. Reminders (Managed by Agent)" section in the context below. DO NOT schedule reminders that are already listed there.
-
-Current Project Context:
-{context_text}
-
-Mohit's Messages (last 24 hours):
-{mentions_text}
-
-FIRST, provide a clear, readable summary of intents found (Reminders, Assignments, Tasks) and the proposed actions.
-
-SECOND, at the end of your response, output ONLY the structured actions in a JSON list.
+    prompt = "".join([
+        MENTIONS_PROMPT_INTRO,
+        current_time,
+        MENTIONS_PROMPT_RULES,
+        context_text,
+        MENTIONS_PROMPT_MESSAGES_HEADER,
+        mentions_text,
+        MENTIONS_PROMPT_INSTRUCTIONS,
+    ])
 
-JSON Schema for EACH action object:
-{{
-  "action_type": "schedule_reminder" | "update_context_task" | "send_message" | "draft_reply",
-  "reasoning": "Brief explanation (e.g., 'Remind Umang about beta release')",
-  "data": {{
-    "target_channel_id": "Channel ID for Slack actions (use original message channel ID)",
-    "target_user_ids": "List of Slack IDs mentioned or implied (e.g., ['U123456'])",
-    "message_text": "The exact message to send (for send_message or draft_reply action)",
-    "reply_to_message_ts": "Timestamp of the message to reply to (for draft_reply action)",
-    "time_iso": "ISO 8601 format for reminders (e.g., 2025-12-06T11:30:00). Must be future time.",
-    "epic_title": "Epic name from context.md (e.g., Home Page Update)",
-    "new_status": "New Status for the task",
-    "new_owner": "New Owner for the task",
-    "new_markdown_content": "The EXACT full markdown content for Section '2. Active Epics & Tasks' to reflect the update. Maintain existing structure."
-  }}
-}}
-
-IMPORTANT: 
-- Use "send_message" when you need to proactively notify the team.
-- Use "draft_reply" when someone asked Mohit a question and you need to draft a response for his approval.
-- Check "3. Reminders (Managed by Agent)" to avoid duplicate reminders.
-
-Example JSON Output:
-```json
-[
-  {{
-    "action_type": "schedule_reminder",
-    "reasoning": "Remind Mohit to take update from Pravin",
-    "data": {{
-      "target_channel_id": "C08JF2UFCR1",
-      "target_user_ids": ["U07FDMFFM5F", "U999888"],
-      "time_iso": "2025-12-06T11:30:00"
-    }}
-  }}
-]
-```
-"""
-
-    client = manager.get_client()
-    
     # Retry logic with API key rotation (similar to sync mode)
     max_retries = len(manager.keys)
     attempts = 0
@@ -398,7 +493,7 @@ Example JSON Output:
     
     while attempts < max_retries:
         try:
-            response = client.models.generate_content(
+            response = manager.current.models.generate_content(
                 model="gemini-flash-latest",
                 contents=prompt,
                 config=types.GenerateContentConfig(
@@ -410,7 +505,7 @@ Example JSON Output:
             error_str = str(e)
             if "429" in error_str or "RESOURCE_EXHAUSTED" in error_str:
                 print(f"\n⚠️  Quota exceeded (Attempt {attempts+1}/{max_retries}). Rotating to next API key...")
-                client = manager.rotate_client()
+                manager.rotate_client()
                 attempts += 1
                 time.sleep(2)  # Brief pause before retry
             else:
@@ -534,9 +629,6 @@ Example JSON Output:
                         time_iso = data.get('time_iso')
                         
                         # Validate that the time is in the future
-                        from datetime import datetime
-                        import pytz
-                        
                         try:
                             # Parse the scheduled time
                             if 'T' in time_iso:
@@ -562,8 +654,6 @@ Example JSON Output:
                         core_action = action.get('reasoning', "A scheduled reminder.")
 
                         # Create the full reminder message using the existing format
-                        from command_processor import create_reminder_message
-                        
                         reminder_message = create_reminder_message(
                             {"action": core_action},
                             target_users or [authorized_user_id]
@@ -580,7 +670,6 @@ Example JSON Output:
                             
                             # Add the reminder to the context.md tracking section
                             try:
-                                from datetime import datetime
                                 dt = datetime.fromisoformat(time_iso.replace('Z', '+00:00'))
                                 reminder_entry = f"- [{dt.strftime('%Y-%m-%d %H:%M')}] {core_action}"
                                 update_section("3. Reminders (Managed by Agent)", reminder_entry, append=True)
@@ -685,6 +774,8 @@ def run_post_intro(channel_id: str):
         print("Error: --channel argument is required for post-intro mode.")
         return
 
+    from slack_tools import send_slack_message
+
     intro_message = (
         "Hello team! :wave:\n\n"
         "I'm the *PM Context Agent*. I'll be passively monitoring this channel to keep our project context documentation updated "
@@ -701,6 +792,9 @@ def run_post_intro(channel_id: str):
         print(f"Failed to post intro message: {e}")
 
 def main():
+    # Load environment variables at startup rather than at import time
+    load_dotenv()
+
     parser = argparse.ArgumentParser(description="PM CLI Tool")
     subparsers = parser.add_subparsers(dest="command", help="Available commands")
 
@@ -708,19 +802,26 @@ def main():
     sync_parser = subparsers.add_parser("sync", help="Check for drift between Context and Slack")
     sync_parser.add_argument("--channels", nargs='+', help="List of Slack Channel IDs to analyze")
     sync_parser.add_argument("--todo-sync", action="store_true", help="Include Slack Self-To-Dos in analysis")
+    sync_parser.set_defaults(func=lambda m, a: run_sync_mode(m, a.channels, a.todo_sync))
 
     # Chat command
     chat_parser = subparsers.add_parser("chat", help="Start the interactive Personal Assistant")
+    chat_parser.set_defaults(func=lambda m, a: run_chat_mode(m))
 
     # Post Intro command
     intro_parser = subparsers.add_parser("post-intro", help="Post an introductory message to a Slack channel")
     intro_parser.add_argument("--channel", help="Slack Channel ID to post to", required=True)
+    intro_parser.set_defaults(func=lambda m, a: run_post_intro(a.channel))
     
     # Process Mentions command (NEW - Intelligent Command Processing)
     mentions_parser = subparsers.add_parser("process-mentions", help="Process bot mentions and execute intelligent commands")
     mentions_parser.add_argument("--channels", nargs='+', help="List of Slack Channel IDs to check for mentions", required=True)
+    mentions_parser.set_defaults(func=lambda m, a: run_process_mentions(m, a.channels))
 
     args = parser.parse_args()
+    if not hasattr(args, "func"):
+        parser.print_help()
+        return
     
     try:
         manager = ClientManager()
@@ -728,16 +829,7 @@ def main():
         print(f"Error initializing client: {e}")
         sys.exit(1)
 
-    if args.command == "sync":
-        run_sync_mode(manager, args.channels, args.todo_sync)
-    elif args.command == "chat":
-        run_chat_mode(manager)
-    elif args.command == "post-intro":
-        run_post_intro(args.channel)
-    elif args.command == "process-mentions":
-        run_process_mentions(manager, args.channels)
-    else:
-        parser.print_help()
+    args.func(manager, args)
 
 if __name__ == "__main__":
     main()
@@ -3,12 +3,219 @@ Memory Manager - Persistent Knowledge Base for PM Agent
 Stores decisions, thread context, and learned patterns using SQLite.
 """
 
+import io
 import os
-import json
+import queue
+import select
+import atexit
 import sqlite3
+import threading
+import time
+import weakref
+from collections import deque
+from concurrent.futures import Future
+from contextlib import contextmanager
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 
+import orjson
+
+
+# Per-connection tuning; page_size, auto_vacuum and journal_mode=WAL are
+# persisted in the database file, the rest must be re-applied on every new
+# connection. page_size and auto_vacuum only take effect on a new database,
+# before any table exists.
+SQLITE_PRAGMAS = (
+    "PRAGMA page_size=8192",
+    "PRAGMA auto_vacuum=INCREMENTAL",
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA busy_timeout=5000",
+)
+
+# SQLite serializes writers, so a single write connection is enough;
+# WAL lets several readers run alongside it.
+READ_POOL_SIZE = 4
+WRITE_POOL_SIZE = 1
+
+# Buffered inserts are flushed in one transaction after this delay,
+# or immediately once this many rows are pending.
+FLUSH_INTERVAL_SECONDS = 0.25
+FLUSH_BATCH_SIZE = 100
+# Most queued statements the writer thread commits in one transaction
+WRITE_QUEUE_BATCH = 500
+
+# Writer-thread control messages; statements are queued as (sql, params, future)
+_WAKE = object()  # rows were buffered: flush within FLUSH_INTERVAL_SECONDS
+_STOP = object()  # flush everything and exit
+
+# get_stats results are reused for this long unless this process writes
+STATS_TTL_SECONDS = 30
+
+# Retention windows for prune(), in days
+PROCESSED_RETENTION_DAYS = 30
+HISTORY_RETENTION_DAYS = 90
+
+# Bump when the schema below changes; _init_db re-runs the (idempotent)
+# DDL only for databases whose PRAGMA user_version is older.
+SCHEMA_VERSION = 4
+
+# Per-connection prepared-statement cache; hot statements below are module
+# constants so their text (the cache key) is identical on every call.
+STATEMENT_CACHE_SIZE = 256
+
+_SQL_INSERT_DECISION = (
+    'INSERT INTO decisions (action_type, approved, reasoning, action_data) '
+    'VALUES (?, ?, ?, ?) RETURNING id'
+)
+_SQL_INSERT_PROCESSED = 'INSERT OR IGNORE INTO processed_messages (message_ts, channel_id) VALUES (?, ?)'
+_SQL_INSERT_ACTION = (
+    'INSERT INTO action_history (action_id, action_type, status, reasoning, action_data, result) '
+    'VALUES (?, ?, ?, ?, ?, ?)'
+)
+_SQL_INSERT_INSIGHT = 'INSERT INTO knowledge (category, content, source, metadata) VALUES (?, ?, ?, ?)'
+_SQL_HAS_ACTION_ON = (
+    'SELECT EXISTS(SELECT 1 FROM action_history WHERE action_type = ? AND status = ? '
+    "AND created_at >= ? AND created_at < date(?, '+1 day'))"
+)
+_SQL_HAS_SENT_REPORT = 'SELECT EXISTS(SELECT 1 FROM sent_reports WHERE report_key = ?)'
+_SQL_CLAIM_REPORT = (
+    'INSERT INTO sent_reports (report_key) VALUES (?) '
+    'ON CONFLICT(report_key) DO NOTHING RETURNING 1'
+)
+_SQL_RELEASE_REPORT = 'DELETE FROM sent_reports WHERE report_key = ?'
+_SQL_SEARCH_FTS = (
+    'SELECT k.* FROM knowledge_fts f JOIN knowledge k ON k.id = f.rowid '
+    'WHERE knowledge_fts MATCH ? AND (? IS NULL OR k.category = ?) '
+    'ORDER BY f.rank LIMIT ?'
+)
+# Matches idx_decisions_orig_content; the expression must stay identical
+_SQL_WAS_SUGGESTED = (
+    "SELECT EXISTS(SELECT 1 FROM decisions "
+    "WHERE json_extract(CAST(action_data AS TEXT), '$.original_content') = ? "
+    "AND created_at >= datetime('now', ?))"
+)
+_SQL_SUGGESTED_CONTENTS = (
+    "SELECT DISTINCT json_extract(CAST(action_data AS TEXT), '$.original_content') FROM decisions "
+    "WHERE json_extract(CAST(action_data AS TEXT), '$.original_content') IN (SELECT value FROM json_each(?)) "
+    "AND created_at >= datetime('now', ?)"
+)
+# Separate statements so the category branch can use idx_knowledge_cat_time
+_SQL_SEARCH_LIKE = 'SELECT * FROM knowledge WHERE content LIKE ? ORDER BY created_at DESC LIMIT ?'
+_SQL_SEARCH_LIKE_CATEGORY = (
+    'SELECT * FROM knowledge WHERE category = ? AND content LIKE ? '
+    'ORDER BY created_at DESC LIMIT ?'
+)
+
+# Indexes for the `WHERE col = ? ORDER BY created_at DESC LIMIT ?` lookups.
+# thread_context(thread_ts, channel_id) is already covered by its UNIQUE constraint.
+INDEX_STATEMENTS = (
+    "CREATE INDEX IF NOT EXISTS idx_decisions_time ON decisions(created_at DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_decisions_type_time ON decisions(action_type, created_at DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_action_history_time ON action_history(created_at DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_action_history_status_time ON action_history(status, created_at DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_action_history_type_time ON action_history(action_type, created_at DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_knowledge_time ON knowledge(created_at DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_knowledge_cat_time ON knowledge(category, created_at DESC)",
+)
+
+# Expression index for was_suggested_recently (SQLite JSON syntax)
+SQLITE_INDEX_STATEMENTS = (
+    "CREATE INDEX IF NOT EXISTS idx_decisions_orig_content ON decisions("
+    "json_extract(CAST(action_data AS TEXT), '$.original_content'), created_at)",
+)
+
+# Full-text index over knowledge.content, kept in sync by triggers
+FTS_STATEMENTS = (
+    '''CREATE VIRTUAL TABLE IF NOT EXISTS knowledge_fts USING fts5(
+        content, category UNINDEXED,
+        content='knowledge', content_rowid='id', tokenize='porter unicode61'
+    )''',
+    '''CREATE TRIGGER IF NOT EXISTS knowledge_fts_ai AFTER INSERT ON knowledge BEGIN
+        INSERT INTO knowledge_fts(rowid, content, category) VALUES (new.id, new.content, new.category);
+    END''',
+    '''CREATE TRIGGER IF NOT EXISTS knowledge_fts_ad AFTER DELETE ON knowledge BEGIN
+        INSERT INTO knowledge_fts(knowledge_fts, rowid, content, category)
+        VALUES ('delete', old.id, old.content, old.category);
+    END''',
+    '''CREATE TRIGGER IF NOT EXISTS knowledge_fts_au AFTER UPDATE ON knowledge BEGIN
+        INSERT INTO knowledge_fts(knowledge_fts, rowid, content, category)
+        VALUES ('delete', old.id, old.content, old.category);
+        INSERT INTO knowledge_fts(rowid, content, category) VALUES (new.id, new.content, new.category);
+    END''',
+)
+
+
+# Directories already created for a database file, so repeated
+# MemoryManager construction skips the makedirs stat
+_ensured_dirs = set()
+
+
+def _dump_json(value) -> Optional[bytes]:
+    """Encode a JSON column value; orjson bytes are stored as a BLOB."""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS) if value else None
+
+
+def _dump_json_text(value) -> Optional[str]:
+    """Like _dump_json, decoded for TEXT columns (Postgres)."""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode() if value else None
+
+
+def _fetch_dicts(cursor: sqlite3.Cursor) -> List[Dict[str, Any]]:
+    """Fetch all rows as dicts, building each directly from the plain tuple."""
+    rows = cursor.fetchall()
+    columns = [col[0] for col in cursor.description]
+    return [dict(zip(columns, row)) for row in rows]
+
+
+def _fts_query(query: str) -> str:
+    """Turn free text into an FTS5 expression: every term quoted, prefix-matched and ANDed."""
+    terms = query.split()
+    return " ".join('"' + term.replace('"', '""') + '"*' for term in terms)
+
+
+class _ConnectionPool:
+    """Thread-safe pool of long-lived SQLite connections."""
+    
+    def __init__(self, factory, size: int):
+        self._factory = factory
+        self._size = size
+        self._idle = queue.LifoQueue()
+        self._all = []
+        self._lock = threading.Lock()
+    
+    @contextmanager
+    def acquire(self):
+        """Borrow a connection, blocking if all `size` connections are in use."""
+        conn = self._checkout()
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+    
+    def _checkout(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if len(self._all) < self._size:
+                conn = self._factory()
+                self._all.append(conn)
+                return conn
+        return self._idle.get()
+    
+    def close(self):
+        """Close every connection owned by the pool."""
+        with self._lock:
+            for conn in self._all:
+                conn.close()
+            self._all = []
+            self._idle = queue.LifoQueue()
+
 
 class MemoryManager:
     """
@@ -25,18 +232,87 @@ class MemoryManager:
             # Check for persistent storage path
             data_dir = os.environ.get('PERSISTENT_DATA_PATH')
             if data_dir:
-                os.makedirs(data_dir, exist_ok=True)
                 db_path = os.path.join(data_dir, "pm_agent.db")
             else:
                 db_path = "memory/pm_agent.db"
         
         self.db_path = db_path
-        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        db_dir = os.path.dirname(db_path)
+        if db_dir and db_dir not in _ensured_dirs:
+            os.makedirs(db_dir, exist_ok=True)
+            _ensured_dirs.add(db_dir)
+        self._read_pool = _ConnectionPool(self._connect, READ_POOL_SIZE)
+        self._write_pool = _ConnectionPool(self._connect, WRITE_POOL_SIZE)
+        
+        # Write-behind buffers for high-volume inserts
+        self._pending_lock = threading.Lock()
+        self._pending_msgs = deque()
+        self._pending_actions = deque()
+        self._write_queue = queue.Queue()
+        # Bumped after every committed write; invalidates cached stats
+        self._write_generation = 0
+        self._stats_cache = (0.0, -1, None)
+        
+        # Every processed timestamp, kept in memory (this process is the only
+        # writer and prune() keeps the table small)
+        self._processed = set()
+        # Report keys known to be sent. release_report_claim() deletes a row (and
+        # discards it here) only after a failed generation, so a stale entry in
+        # another process can at worst skip that process's retry of the report.
+        self._sent_reports = set()
+        
         self._init_db()
+        self._load_processed()
+        
+        # All writes go through one thread; SQLite serializes writers anyway
+        self._writer = threading.Thread(target=self._writer_loop, name="memory-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.flush)
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open an autocommit connection with the WAL/cache PRAGMAs applied."""
+        conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            isolation_level=None,
+            cached_statements=STATEMENT_CACHE_SIZE,
+        )
+        for pragma in SQLITE_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+    
+    def close(self):
+        """Flush buffered writes, stop the writer thread and close all pooled connections."""
+        if self._writer.is_alive():
+            self._write_queue.put(_STOP)
+            self._writer.join()
+        self._read_pool.close()
+        self._write_pool.close()
     
     def _init_db(self):
-        """Initialize database tables if they don't exist."""
-        conn = sqlite3.connect(self.db_path)
+        """
+        Initialize database tables if they don't exist.
+        Skipped entirely when the file's user_version is already current.
+        """
+        with self._write_pool.acquire() as conn:
+            version = conn.execute('PRAGMA user_version').fetchone()[0]
+            if version >= SCHEMA_VERSION:
+                self._fts_enabled = conn.execute(
+                    "SELECT EXISTS(SELECT 1 FROM sqlite_master WHERE name = 'knowledge_fts')"
+                ).fetchone()[0] == 1
+                return
+            
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                self._create_schema(conn)
+                conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+    
+    def _create_schema(self, conn: sqlite3.Connection):
+        """Create all tables, indexes and the FTS index (idempotent)."""
         cursor = conn.cursor()
         
         # Decisions table - track what was approved/rejected
@@ -108,32 +384,155 @@ class MemoryManager:
             )
         ''')
         
-        conn.commit()
-        conn.close()
-    
-    def add_processed_message(self, message_ts: str, channel_id: str = ""):
-        """Mark a message as processed in the persistent DB."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        for statement in INDEX_STATEMENTS + SQLITE_INDEX_STATEMENTS:
+            cursor.execute(statement)
+        
+        # Full-text search on knowledge (falls back to LIKE if FTS5 is unavailable)
         try:
-            cursor.execute(
-                'INSERT OR IGNORE INTO processed_messages (message_ts, channel_id) VALUES (?, ?)',
-                (message_ts, channel_id)
-            )
-            conn.commit()
+            fts_exists = cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'knowledge_fts'"
+            ).fetchone() is not None
+            for statement in FTS_STATEMENTS:
+                cursor.execute(statement)
+            if not fts_exists:
+                # Index rows written before the FTS table existed
+                cursor.execute("INSERT INTO knowledge_fts(knowledge_fts) VALUES ('rebuild')")
+            self._fts_enabled = True
+        except sqlite3.OperationalError as e:
+            print(f"FTS5 unavailable, using LIKE search: {e}")
+            self._fts_enabled = False
+
+    def _schedule_flush(self):
+        """
+        Tell the writer thread about newly buffered rows.
+        Caller must hold `_pending_lock`.
+        """
+        pending = len(self._pending_msgs) + len(self._pending_actions)
+        if pending >= FLUSH_BATCH_SIZE:
+            self._write_queue.put((None, None, None))
+        elif pending == 1:
+            self._write_queue.put(_WAKE)
+
+    def _submit(self, sql: Optional[str], params=()):
+        """
+        Queue a statement for the writer thread and wait for it to commit.
+
+        Args:
+            sql: Statement to run, or None for a bare flush barrier
+            params: A parameter tuple, or a list of tuples to run with executemany
+
+        Returns:
+            The statement's first result row (e.g. from RETURNING), or None
+        """
+        if not self._writer.is_alive():
+            raise RuntimeError("MemoryManager is closed")
+        future = Future()
+        self._write_queue.put((sql, params, future))
+        return future.result()
+
+    def flush(self):
+        """Block until all buffered and queued writes are committed."""
+        if self._writer.is_alive():
+            self._submit(None)
+
+    def _writer_loop(self):
+        """Commit queued statements, plus any buffered rows, one transaction per batch."""
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                items = [self._write_queue.get(timeout=timeout)]
+            except queue.Empty:
+                items = []
+            while len(items) < WRITE_QUEUE_BATCH:
+                try:
+                    items.append(self._write_queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            statements = [item for item in items if isinstance(item, tuple)]
+            # Timed out, got a statement, or stopping: write now; a bare
+            # wake-up only arms the flush deadline so buffered rows batch up
+            if statements or not items or _STOP in items:
+                self._write_batch(statements)
+                deadline = None
+            elif deadline is None:
+                deadline = time.monotonic() + FLUSH_INTERVAL_SECONDS
+            
+            if _STOP in items:
+                return
+
+    def _write_batch(self, statements: list):
+        """Write buffered rows and queued statements in a single transaction."""
+        with self._pending_lock:
+            msgs, self._pending_msgs = self._pending_msgs, deque()
+            actions, self._pending_actions = self._pending_actions, deque()
+        
+        results = []
+        try:
+            if msgs or actions or any(sql for sql, _, _ in statements):
+                with self._write_pool.acquire() as conn:
+                    conn.execute('BEGIN IMMEDIATE')
+                    try:
+                        if msgs:
+                            conn.executemany(_SQL_INSERT_PROCESSED, msgs)
+                        if actions:
+                            conn.executemany(_SQL_INSERT_ACTION, actions)
+                        for sql, params, future in statements:
+                            if sql is None:
+                                results.append((future, None, None))
+                                continue
+                            try:
+                                if isinstance(params, list):
+                                    conn.executemany(sql, params)
+                                    results.append((future, None, None))
+                                else:
+                                    results.append((future, conn.execute(sql, params).fetchone(), None))
+                            except sqlite3.Error as e:
+                                # A failed statement is undone on its own; the batch still commits
+                                results.append((future, None, e))
+                        conn.execute('COMMIT')
+                    except Exception:
+                        conn.execute('ROLLBACK')
+                        raise
+                self._write_generation += 1
+            else:
+                results = [(future, None, None) for _, _, future in statements]
         except Exception as e:
-            print(f"Error marking message processed: {e}")
-        finally:
-            conn.close()
+            print(f"Error flushing buffered writes: {e}")
+            results = [(future, None, e) for _, _, future in statements]
+            if msgs or actions:
+                # Nothing was committed: put the rows back (ahead of newer ones) and retry later
+                with self._pending_lock:
+                    self._pending_msgs.extendleft(reversed(msgs))
+                    self._pending_actions.extendleft(reversed(actions))
+                self._write_queue.put(_WAKE)
+        
+        for future, result, error in results:
+            if future is None:
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+    def _load_processed(self):
+        """Load every processed message timestamp into memory."""
+        with self._read_pool.acquire() as conn:
+            loaded = {message_ts for (message_ts,) in conn.execute('SELECT message_ts FROM processed_messages')}
+        with self._pending_lock:
+            self._processed = loaded | {message_ts for message_ts, _ in self._pending_msgs}
+    
+    def add_processed_message(self, message_ts: str, channel_id: str = ""):
+        """Mark a message as processed (buffered, flushed in batches)."""
+        with self._pending_lock:
+            self._processed.add(message_ts)
+            self._pending_msgs.append((message_ts, channel_id))
+            self._schedule_flush()
 
     def is_message_processed(self, message_ts: str) -> bool:
-        """Check if a message has already been processed."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute('SELECT 1 FROM processed_messages WHERE message_ts = ?', (message_ts,))
-        result = cursor.fetchone()
-        conn.close()
-        return result is not None
+        """Check if a message has already been processed (in-memory, no SQL)."""
+        return message_ts in self._processed
 
     def log_decision(self, action_type: str, approved: bool, reasoning: str, action_data: dict = None) -> int:
         """
@@ -148,19 +547,10 @@ class MemoryManager:
         Returns:
             The ID of the logged decision
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT INTO decisions (action_type, approved, reasoning, action_data)
-            VALUES (?, ?, ?, ?)
-        ''', (action_type, 1 if approved else 0, reasoning, json.dumps(action_data) if action_data else None))
-        
-        decision_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
-        
-        return decision_id
+        return self._submit(
+            _SQL_INSERT_DECISION,
+            (action_type, 1 if approved else 0, reasoning, _dump_json(action_data))
+        )[0]
     
     def get_decision_history(self, action_type: str = None, limit: int = 10) -> List[Dict[str, Any]]:
         """
@@ -173,24 +563,51 @@ class MemoryManager:
         Returns:
             List of decision records
         """
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
+        with self._read_pool.acquire() as conn:
+            cursor = conn.cursor()
+            
+            if action_type:
+                cursor.execute('''
+                    SELECT * FROM decisions WHERE action_type = ?
+                    ORDER BY created_at DESC LIMIT ?
+                ''', (action_type, limit))
+            else:
+                cursor.execute('''
+                    SELECT * FROM decisions ORDER BY created_at DESC LIMIT ?
+                ''', (limit,))
+            
+            rows = _fetch_dicts(cursor)
         
-        if action_type:
-            cursor.execute('''
-                SELECT * FROM decisions WHERE action_type = ?
-                ORDER BY created_at DESC LIMIT ?
-            ''', (action_type, limit))
-        else:
-            cursor.execute('''
-                SELECT * FROM decisions ORDER BY created_at DESC LIMIT ?
-            ''', (limit,))
+        for result in rows:
+            if result.get('action_data'):
+                result['action_data'] = orjson.loads(result['action_data'])
+        
+        return rows
+
+    def was_suggested_recently(self, content: str, days: int = 1) -> bool:
+        """
+        Check whether a decision about `content` was logged in the last `days` days.
         
-        rows = cursor.fetchall()
-        conn.close()
+        Matches action_data["original_content"] via idx_decisions_orig_content.
+        """
+        with self._read_pool.acquire() as conn:
+            row = conn.execute(_SQL_WAS_SUGGESTED, (content, f'-{int(days)} days')).fetchone()
+        return bool(row[0])
+
+    def recently_suggested_contents(self, contents: List[str], days: int = 1) -> set:
+        """
+        Batch form of was_suggested_recently.
         
-        return [dict(row) for row in rows]
+        Returns:
+            The subset of `contents` with a decision logged in the last `days` days
+        """
+        if not contents:
+            return set()
+        with self._read_pool.acquire() as conn:
+            rows = conn.execute(
+                _SQL_SUGGESTED_CONTENTS, (orjson.dumps(list(contents)).decode(), f'-{int(days)} days')
+            ).fetchall()
+        return {content for (content,) in rows}
     
     def get_approval_rate(self, action_type: str = None) -> Dict[str, Any]:
         """
@@ -199,26 +616,21 @@ class MemoryManager:
         Returns:
             Dict with total, approved, rejected counts and rate
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        if action_type:
-            cursor.execute('''
-                SELECT 
-                    COUNT(*) as total,
-                    SUM(approved) as approved
-                FROM decisions WHERE action_type = ?
-            ''', (action_type,))
-        else:
-            cursor.execute('''
-                SELECT 
-                    COUNT(*) as total,
-                    SUM(approved) as approved
-                FROM decisions
-            ''')
-        
-        row = cursor.fetchone()
-        conn.close()
+        with self._read_pool.acquire() as conn:
+            if action_type:
+                row = conn.execute('''
+                    SELECT 
+                        COUNT(*) as total,
+                        SUM(approved) as approved
+                    FROM decisions WHERE action_type = ?
+                ''', (action_type,)).fetchone()
+            else:
+                row = conn.execute('''
+                    SELECT 
+                        COUNT(*) as total,
+                        SUM(approved) as approved
+                    FROM decisions
+                ''').fetchone()
         
         total = row[0] or 0
         approved = row[1] or 0
@@ -240,20 +652,14 @@ class MemoryManager:
             summary: Summary of the thread's content/context
             entities: List of extracted entities (user mentions, topics, etc.)
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
+        self._submit('''
             INSERT INTO thread_context (thread_ts, channel_id, summary, entities, updated_at)
             VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
             ON CONFLICT(thread_ts, channel_id) DO UPDATE SET
                 summary = excluded.summary,
                 entities = excluded.entities,
                 updated_at = CURRENT_TIMESTAMP
-        ''', (thread_ts, channel_id, summary, json.dumps(entities) if entities else None))
-        
-        conn.commit()
-        conn.close()
+        ''', (thread_ts, channel_id, summary, _dump_json(entities)))
     
     def get_thread_context(self, thread_ts: str, channel_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -262,22 +668,20 @@ class MemoryManager:
         Returns:
             Thread context dict or None if not found
         """
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT * FROM thread_context 
-            WHERE thread_ts = ? AND channel_id = ?
-        ''', (thread_ts, channel_id))
-        
-        row = cursor.fetchone()
-        conn.close()
+        with self._read_pool.acquire() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                SELECT * FROM thread_context 
+                WHERE thread_ts = ? AND channel_id = ?
+            ''', (thread_ts, channel_id))
+            
+            rows = _fetch_dicts(cursor)
         
-        if row:
-            result = dict(row)
+        if rows:
+            result = rows[0]
             if result.get('entities'):
-                result['entities'] = json.loads(result['entities'])
+                result['entities'] = orjson.loads(result['entities'])
             return result
         return None
     
@@ -297,79 +701,79 @@ class MemoryManager:
             source: Where this was learned from (e.g., 'slack:C123:ts456')
             metadata: Additional metadata
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT INTO knowledge (category, content, source, metadata)
-            VALUES (?, ?, ?, ?)
-        ''', (category, content, source, json.dumps(metadata) if metadata else None))
+        self._submit(_SQL_INSERT_INSIGHT, (category, content, source, _dump_json(metadata)))
+
+    def store_insights_bulk(self, rows: List[tuple]):
+        """
+        Store several insights at once.
         
-        conn.commit()
-        conn.close()
+        Args:
+            rows: (category, content, source, metadata) tuples, as for store_insight
+        """
+        if not rows:
+            return
+        # One executemany, committed in a single writer transaction
+        self._submit(_SQL_INSERT_INSIGHT, [
+            (category, content, source, _dump_json(metadata))
+            for category, content, source, metadata in rows
+        ])
     
     def search_memory(self, query: str, category: str = None, limit: int = 5) -> List[Dict[str, Any]]:
         """
         Search through stored knowledge.
         
         Args:
-            query: Search query (simple LIKE matching)
+            query: Search query (terms are prefix-matched via the FTS5 index)
             category: Optional category filter
             limit: Maximum results
             
         Returns:
-            List of matching knowledge entries
+            List of matching knowledge entries, best match first
         """
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
+        fts_query = _fts_query(query) if self._fts_enabled else ""
         
-        if category:
-            cursor.execute('''
-                SELECT * FROM knowledge 
-                WHERE category = ? AND content LIKE ?
-                ORDER BY created_at DESC LIMIT ?
-            ''', (category, f'%{query}%', limit))
-        else:
-            cursor.execute('''
-                SELECT * FROM knowledge 
-                WHERE content LIKE ?
-                ORDER BY created_at DESC LIMIT ?
-            ''', (f'%{query}%', limit))
-        
-        rows = cursor.fetchall()
-        conn.close()
+        with self._read_pool.acquire() as conn:
+            cursor = conn.cursor()
+            
+            if fts_query:
+                cursor.execute(_SQL_SEARCH_FTS, (fts_query, category, category, limit))
+            # The wildcard-wrapped term is bound as a parameter, never inlined
+            elif category:
+                cursor.execute(_SQL_SEARCH_LIKE_CATEGORY, (category, f'%{query}%', limit))
+            else:
+                cursor.execute(_SQL_SEARCH_LIKE, (f'%{query}%', limit))
+            
+            rows = _fetch_dicts(cursor)
         
-        results = []
-        for row in rows:
-            result = dict(row)
+        for result in rows:
             if result.get('metadata'):
-                result['metadata'] = json.loads(result['metadata'])
-            results.append(result)
+                result['metadata'] = orjson.loads(result['metadata'])
         
-        return results
+        return rows
     
     def get_knowledge_by_category(self, category: str, limit: int = 20) -> List[Dict[str, Any]]:
         """Get all knowledge in a category."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT * FROM knowledge 
-            WHERE category = ?
-            ORDER BY created_at DESC LIMIT ?
-        ''', (category, limit))
+        with self._read_pool.acquire() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                SELECT * FROM knowledge 
+                WHERE category = ?
+                ORDER BY created_at DESC LIMIT ?
+            ''', (category, limit))
+            
+            rows = _fetch_dicts(cursor)
         
-        rows = cursor.fetchall()
-        conn.close()
+        for result in rows:
+            if result.get('metadata'):
+                result['metadata'] = orjson.loads(result['metadata'])
         
-        return [dict(row) for row in rows]
+        return rows
     
     def log_action_execution(self, action_id: str, action_type: str, status: str, 
                              reasoning: str, action_data: dict = None, result: str = None):
         """
-        Log an executed action for history.
+        Log an executed action for history (buffered, flushed in batches).
         
         Args:
             action_id: Unique action identifier
@@ -379,18 +783,12 @@ class MemoryManager:
             action_data: Action parameters
             result: Execution result or error message
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT INTO action_history (action_id, action_type, status, reasoning, action_data, result)
-            VALUES (?, ?, ?, ?, ?, ?)
-        ''', (action_id, action_type, status, reasoning, 
-              json.dumps(action_data) if action_data else None, result))
-        
-        conn.commit()
-        conn.close()
-    
+        row = (action_id, action_type, status, reasoning,
+               _dump_json(action_data), result)
+        with self._pending_lock:
+            self._pending_actions.append(row)
+            self._schedule_flush()
+
     def get_action_history(self, limit: int = 50, status: str = None) -> List[Dict[str, Any]]:
         """
         Get action execution history.
@@ -402,71 +800,121 @@ class MemoryManager:
         Returns:
             List of action history records
         """
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        
-        if status:
-            cursor.execute('''
-                SELECT * FROM action_history 
-                WHERE status = ?
-                ORDER BY created_at DESC LIMIT ?
-            ''', (status, limit))
-        else:
-            cursor.execute('''
-                SELECT * FROM action_history 
-                ORDER BY created_at DESC LIMIT ?
-            ''', (limit,))
-        
-        rows = cursor.fetchall()
-        conn.close()
+        self.flush()
+        with self._read_pool.acquire() as conn:
+            cursor = conn.cursor()
+            
+            if status:
+                cursor.execute('''
+                    SELECT * FROM action_history 
+                    WHERE status = ?
+                    ORDER BY created_at DESC LIMIT ?
+                ''', (status, limit))
+            else:
+                cursor.execute('''
+                    SELECT * FROM action_history 
+                    ORDER BY created_at DESC LIMIT ?
+                ''', (limit,))
+            
+            rows = _fetch_dicts(cursor)
         
-        results = []
-        for row in rows:
-            result = dict(row)
+        for result in rows:
             if result.get('action_data'):
-                result['action_data'] = json.loads(result['action_data'])
-            results.append(result)
+                result['action_data'] = orjson.loads(result['action_data'])
         
-        return results
+        return rows
+    
+    def has_action_on(self, action_type: str, day: str, status: str = "SUCCESS") -> bool:
+        """
+        Check whether an action of this type and status was logged on a given day.
+        
+        Args:
+            action_type: Action type to look for (e.g. 'weekly_report')
+            day: Date as 'YYYY-MM-DD'
+            status: Status the action must have
+        """
+        self.flush()
+        with self._read_pool.acquire() as conn:
+            row = conn.execute(_SQL_HAS_ACTION_ON, (action_type, status, day, day)).fetchone()
+        return bool(row[0])
     
     def get_stats(self) -> Dict[str, Any]:
         """
         Get overall memory statistics.
         
+        Cached for STATS_TTL_SECONDS; any write from this process invalidates it.
+        
         Returns:
             Dict with counts and stats
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('SELECT COUNT(*) FROM decisions')
-        decisions_count = cursor.fetchone()[0]
-        
-        cursor.execute('SELECT COUNT(*) FROM thread_context')
-        threads_count = cursor.fetchone()[0]
-        
-        cursor.execute('SELECT COUNT(*) FROM knowledge')
-        knowledge_count = cursor.fetchone()[0]
-        
-        cursor.execute('SELECT COUNT(*) FROM action_history')
-        actions_count = cursor.fetchone()[0]
-        
-        cursor.execute("SELECT COUNT(*) FROM action_history WHERE status = 'SUCCESS'")
-        successful_actions = cursor.fetchone()[0]
-        
-        conn.close()
+        self.flush()
+        cached_at, generation, stats = self._stats_cache
+        if (stats is not None and generation == self._write_generation
+                and time.monotonic() - cached_at < STATS_TTL_SECONDS):
+            return dict(stats)
         
-        approval = self.get_approval_rate()
+        generation = self._write_generation
+        with self._read_pool.acquire() as conn:
+            # All counts in a single round-trip
+            (decisions_count, threads_count, knowledge_count,
+             actions_count, successful_actions, approved_count) = conn.execute('''
+                SELECT
+                    (SELECT COUNT(*) FROM decisions),
+                    (SELECT COUNT(*) FROM thread_context),
+                    (SELECT COUNT(*) FROM knowledge),
+                    (SELECT COUNT(*) FROM action_history),
+                    (SELECT COUNT(*) FROM action_history WHERE status = 'SUCCESS'),
+                    (SELECT COUNT(*) FROM decisions WHERE approved = 1)
+            ''').fetchone()
         
-        return {
+        stats = {
             "decisions": decisions_count,
             "threads": threads_count,
             "knowledge_entries": knowledge_count,
             "total_actions": actions_count,
             "successful_actions": successful_actions,
-            "approval_rate": approval["rate"]
+            "approval_rate": round(approved_count / decisions_count * 100, 1) if decisions_count > 0 else 0
         }
+        self._stats_cache = (time.monotonic(), generation, stats)
+        return dict(stats)
+    
+    def prune(self, days: int = PROCESSED_RETENTION_DAYS,
+              history_days: int = HISTORY_RETENTION_DAYS) -> int:
+        """
+        Delete old rows so the hot tables (and their indexes) stay small.
+        
+        Args:
+            days: Keep processed message markers newer than this
+            history_days: Keep decisions and action history newer than this
+            
+        Returns:
+            Number of rows deleted
+        """
+        self.flush()
+        with self._write_pool.acquire() as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                deleted = conn.execute(
+                    "DELETE FROM processed_messages WHERE processed_at < datetime('now', ?)",
+                    (f'-{days} days',)
+                ).rowcount
+                for table in ('decisions', 'action_history'):
+                    deleted += conn.execute(
+                        f"DELETE FROM {table} WHERE created_at < datetime('now', ?)",
+                        (f'-{history_days} days',)
+                    ).rowcount
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+            self._write_generation += 1
+            # Return the freed pages to the filesystem (no-op without auto_vacuum).
+            # execute() steps the pragma once, freeing a single page; executescript runs it to completion.
+            conn.executescript('PRAGMA incremental_vacuum;')
+            # Refresh planner statistics now that the tables have shrunk
+            conn.execute('PRAGMA optimize')
+        self._load_processed()
+        return deleted
     
     def has_sent_report(self, report_key: str) -> bool:
         """
@@ -478,12 +926,13 @@ class MemoryManager:
         Returns:
             True if report was already sent, False otherwise
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute('SELECT 1 FROM sent_reports WHERE report_key = ?', (report_key,))
-        result = cursor.fetchone()
-        conn.close()
-        return result is not None
+        if report_key in self._sent_reports:
+            return True
+        with self._read_pool.acquire() as conn:
+            sent = conn.execute(_SQL_HAS_SENT_REPORT, (report_key,)).fetchone()[0] == 1
+        if sent:
+            self._sent_reports.add(report_key)
+        return sent
     
     def mark_report_sent(self, report_key: str):
         """
@@ -492,42 +941,61 @@ class MemoryManager:
         Args:
             report_key: Unique key for the report (e.g., 'daily_morning_2025-12-10')
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
         try:
-            cursor.execute(
-                'INSERT OR REPLACE INTO sent_reports (report_key) VALUES (?)',
-                (report_key,)
-            )
-            conn.commit()
+            self.try_mark_report_sent(report_key)
         except Exception as e:
             print(f"Error marking report sent: {e}")
-        finally:
-            conn.close()
+    
+    def try_mark_report_sent(self, report_key: str) -> bool:
+        """
+        Atomically mark a report as sent.
+        
+        Args:
+            report_key: Unique key for the report (e.g., 'daily_morning_2025-12-10')
+            
+        Returns:
+            True if this call marked it (caller should send), False if it was already sent
+        """
+        if report_key in self._sent_reports:
+            return False
+        inserted = self._submit(_SQL_CLAIM_REPORT, (report_key,)) is not None
+        self._sent_reports.add(report_key)
+        return inserted
+
+    def release_report_claim(self, report_key: str):
+        """
+        Undo try_mark_report_sent, e.g. when generating the claimed report failed.
+        
+        Args:
+            report_key: Unique key for the report (e.g., 'weekly_report_2025-12-12')
+        """
+        self._submit(_SQL_RELEASE_REPORT, (report_key,))
+        # After the delete, so a concurrent has_sent_report can't re-cache the old row
+        self._sent_reports.discard(report_key)
+
+    def _context_path(self) -> str:
+        data_dir = os.environ.get('PERSISTENT_DATA_PATH')
+        return os.path.join(data_dir, "context.md") if data_dir else "context.md"
 
     def save_context(self, content: str):
-        """Save project context (File based fallback)."""
-        # Determine path
+        """Save project context (File based fallback), durably."""
         try:
-            path = "context.md"
-            if os.environ.get('PERSISTENT_DATA_PATH'):
-                path = os.path.join(os.environ.get('PERSISTENT_DATA_PATH'), "context.md")
-            
-            with open(path, "w") as f:
+            # Written in place (not tmp + rename): context.md is bind-mounted into the
+            # dashboard as a single file, which would keep serving the replaced inode.
+            # This also keeps the file's mode and owner.
+            with open(self._context_path(), "w") as f:
                 f.write(content)
+                f.flush()
+                os.fsync(f.fileno())
         except Exception as e:
             print(f"Error saving context file: {e}")
 
     def load_context(self) -> str:
         """Load project context (File based fallback)."""
         try:
-            path = "context.md"
-            if os.environ.get('PERSISTENT_DATA_PATH'):
-                path = os.path.join(os.environ.get('PERSISTENT_DATA_PATH'), "context.md")
-            
-            if os.path.exists(path):
-                with open(path, "r") as f:
-                    return f.read()
+            with open(self._context_path(), "r") as f:
+                return f.read()
+        except FileNotFoundError:
             return ""
         except Exception as e:
             print(f"Error loading context file: {e}")
@@ -537,361 +1005,536 @@ class MemoryManager:
 # Start Postgres Support
 try:
     import psycopg2
-    from psycopg2.extras import RealDictCursor
+    from psycopg2.extras import RealDictCursor, execute_values
+    from psycopg2.pool import ThreadedConnectionPool
     POSTGRES_AVAILABLE = True
 except ImportError:
     POSTGRES_AVAILABLE = False
 
+# Long-lived connections shared by the daemon's job threads
+POSTGRES_POOL_SIZE = 8
+
+# Bulk inserts larger than this go through COPY ... FROM STDIN
+POSTGRES_COPY_THRESHOLD = 16
+
+# project_context is re-read on every proactive check; cache it briefly and let
+# save_context NOTIFY every process (including this one) to drop its copy
+CONTEXT_TTL_SECONDS = 5
+CONTEXT_CHANNEL = "project_context_changed"
+
+# GIN full-text index; search_memory must use the same to_tsvector expression
+POSTGRES_FTS_STATEMENTS = (
+    "CREATE INDEX IF NOT EXISTS idx_knowledge_fts ON knowledge USING GIN (to_tsvector('english', content))",
+)
+
+
+# Hot statements, PREPAREd once per pooled connection and run with EXECUTE
+POSTGRES_PREPARED_STATEMENTS = {
+    "mm_insert_processed": "INSERT INTO processed_messages (message_ts, channel_id) VALUES ($1, $2) ON CONFLICT DO NOTHING",
+    "mm_is_processed": "SELECT EXISTS(SELECT 1 FROM processed_messages WHERE message_ts = $1)",
+    "mm_insert_decision": "INSERT INTO decisions (action_type, approved, reasoning, action_data) VALUES ($1, $2, $3, $4) RETURNING id",
+    "mm_has_sent_report": "SELECT EXISTS(SELECT 1 FROM sent_reports WHERE report_key = $1)",
+    "mm_claim_report": "INSERT INTO sent_reports (report_key) VALUES ($1) ON CONFLICT DO NOTHING RETURNING 1",
+    "mm_upsert_thread": (
+        "INSERT INTO thread_context (thread_ts, channel_id, summary, entities, updated_at) "
+        "VALUES ($1, $2, $3, $4, CURRENT_TIMESTAMP) "
+        "ON CONFLICT(thread_ts, channel_id) DO UPDATE SET "
+        "summary = EXCLUDED.summary, entities = EXCLUDED.entities, updated_at = CURRENT_TIMESTAMP"
+    ),
+    "mm_insert_insight": "INSERT INTO knowledge (category, content, source, metadata) VALUES ($1, $2, $3, $4)",
+    "mm_save_context": (
+        "INSERT INTO project_context (key, content, updated_at) VALUES ('main', $1, CURRENT_TIMESTAMP) "
+        "ON CONFLICT(key) DO UPDATE SET content = EXCLUDED.content, updated_at = CURRENT_TIMESTAMP"
+    ),
+    "mm_load_context": "SELECT content FROM project_context WHERE key = 'main'",
+    "mm_suggested_contents": (
+        "SELECT DISTINCT (action_data::jsonb)->>'original_content' FROM decisions "
+        "WHERE (action_data::jsonb)->>'original_content' = ANY($1) "
+        "AND created_at >= NOW() - make_interval(days => $2)"
+    ),
+    "mm_has_action_on": (
+        "SELECT EXISTS(SELECT 1 FROM action_history WHERE action_type = $1 AND status = $2 "
+        "AND created_at >= $3::date AND created_at < $3::date + 1)"
+    ),
+    "mm_was_suggested": (
+        "SELECT EXISTS(SELECT 1 FROM decisions "
+        "WHERE (action_data::jsonb)->>'original_content' = $1 "
+        "AND created_at >= NOW() - make_interval(days => $2))"
+    ),
+}
+
+# action_data is TEXT holding JSON; the cast is immutable, so it can be indexed
+POSTGRES_INDEX_STATEMENTS = (
+    "CREATE INDEX IF NOT EXISTS idx_decisions_orig_content ON decisions "
+    "(((action_data::jsonb)->>'original_content'), created_at)",
+)
+
+# Trigram index so the ILIKE '%term%' fallback in search_memory is index-backed
+POSTGRES_TRGM_STATEMENTS = (
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS idx_knowledge_content_trgm ON knowledge USING GIN (content gin_trgm_ops)",
+)
+
+
+def _copy_field(value: Optional[str]) -> str:
+    """Encode one field for COPY's text format."""
+    if value is None:
+        return "\\N"
+    return (value.replace("\\", "\\\\").replace("\t", "\\t")
+            .replace("\n", "\\n").replace("\r", "\\r"))
+
+
+def _pg_tsquery(query: str) -> str:
+    """Postgres counterpart of _fts_query: every term quoted, prefix-matched and ANDed."""
+    terms = query.split()
+    return " & ".join("'" + term.replace("\\", "\\\\").replace("'", "''") + "':*" for term in terms)
+
+
 class PostgresMemoryManager:
     """PostgreSQL implementation of MemoryManager."""
     
     def __init__(self, db_url: str):
         self.db_url = db_url
+        self._pool = ThreadedConnectionPool(1, POSTGRES_POOL_SIZE, db_url)
+        # Timestamps known to be processed; other instances may write to the
+        # same database, so only positive answers are cached
+        self._processed = set()
+        # Names already PREPAREd on each pooled connection
+        self._prepared = weakref.WeakKeyDictionary()
+        # (cached_at, value) for load_context / get_stats
+        self._ctx_cache = None
+        self._stats_cache = None
+        self._closed = threading.Event()
         self._init_db()
+        self._listener = threading.Thread(target=self._listen_loop, name="memory-listener", daemon=True)
+        self._listener.start()
 
     def get_connection(self):
-        return psycopg2.connect(self.db_url)
+        """Borrow a pooled connection; hand it back with `put_connection`."""
+        return self._pool.getconn()
 
-    def _init_db(self):
-        """Initialize Postgres tables."""
-        conn = self.get_connection()
+    def put_connection(self, conn):
+        """Return a connection to the pool (any open transaction is rolled back)."""
+        self._pool.putconn(conn)
+
+    def close(self):
+        self._closed.set()
+        self._pool.closeall()
+
+    @contextmanager
+    def _cursor(self, cursor_factory=None):
+        """
+        Cursor on a pooled connection: commits on success, rolls back on
+        error, and always returns the connection to the pool.
+        """
+        conn = self._pool.getconn()
         try:
-            with conn.cursor() as cursor:
-                # Decisions
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS decisions (
-                        id SERIAL PRIMARY KEY,
-                        action_type TEXT NOT NULL,
-                        approved INTEGER NOT NULL,
-                        reasoning TEXT,
-                        action_data TEXT,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                ''')
-                
-                # Thread context
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS thread_context (
-                        id SERIAL PRIMARY KEY,
-                        thread_ts TEXT NOT NULL,
-                        channel_id TEXT NOT NULL,
-                        summary TEXT,
-                        entities TEXT,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        UNIQUE(thread_ts, channel_id)
-                    )
-                ''')
-                
-                # Processed Messages
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS processed_messages (
-                        message_ts TEXT PRIMARY KEY,
-                        channel_id TEXT,
-                        processed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                ''')
-                
-                # Knowledge
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS knowledge (
-                        id SERIAL PRIMARY KEY,
-                        category TEXT NOT NULL,
-                        content TEXT NOT NULL,
-                        source TEXT,
-                        metadata TEXT,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                ''')
-                
-                # Action history
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS action_history (
-                        id SERIAL PRIMARY KEY,
-                        action_id TEXT NOT NULL,
-                        action_type TEXT NOT NULL,
-                        status TEXT NOT NULL,
-                        reasoning TEXT,
-                        action_data TEXT,
-                        result TEXT,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                ''')
-
-                # Sent reports
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS sent_reports (
-                        report_key TEXT PRIMARY KEY,
-                        sent_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                ''')
-                
-                # Project Context (New for full robustness)
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS project_context (
-                        key TEXT PRIMARY KEY,
-                        content TEXT,
-                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                ''')
+            with conn.cursor(cursor_factory=cursor_factory) as cursor:
+                yield cursor
             conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
         finally:
-            conn.close()
+            self._pool.putconn(conn)
+
+    def _listen_loop(self):
+        """Drop the cached context whenever any process NOTIFYs CONTEXT_CHANNEL."""
+        while not self._closed.is_set():
+            try:
+                conn = psycopg2.connect(self.db_url)
+                conn.autocommit = True
+                with conn.cursor() as cursor:
+                    cursor.execute(f"LISTEN {CONTEXT_CHANNEL}")
+                # Anything may have changed while we were not listening
+                self._ctx_cache = None
+                try:
+                    while not self._closed.is_set():
+                        if select.select([conn], [], [], CONTEXT_TTL_SECONDS) == ([], [], []):
+                            continue
+                        conn.poll()
+                        if conn.notifies:
+                            conn.notifies.clear()
+                            self._ctx_cache = None
+                finally:
+                    conn.close()
+            except Exception as e:
+                print(f"Context listener error: {e}")
+                self._closed.wait(CONTEXT_TTL_SECONDS)
+
+    def _execute_prepared(self, cursor, name: str, params: tuple):
+        """Run a POSTGRES_PREPARED_STATEMENTS entry, preparing it on first use per connection."""
+        prepared = self._prepared.setdefault(cursor.connection, set())
+        if name not in prepared:
+            cursor.execute(f"PREPARE {name} AS {POSTGRES_PREPARED_STATEMENTS[name]}")
+            prepared.add(name)
+        if params:
+            cursor.execute(f"EXECUTE {name} ({', '.join(['%s'] * len(params))})", params)
+        else:
+            cursor.execute(f"EXECUTE {name}")
+
+    def _init_db(self):
+        """Initialize Postgres tables."""
+        with self._cursor() as cursor:
+            # Decisions
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS decisions (
+                    id SERIAL PRIMARY KEY,
+                    action_type TEXT NOT NULL,
+                    approved INTEGER NOT NULL,
+                    reasoning TEXT,
+                    action_data TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            
+            # Thread context
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS thread_context (
+                    id SERIAL PRIMARY KEY,
+                    thread_ts TEXT NOT NULL,
+                    channel_id TEXT NOT NULL,
+                    summary TEXT,
+                    entities TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    UNIQUE(thread_ts, channel_id)
+                )
+            ''')
+            
+            # Processed Messages
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS processed_messages (
+                    message_ts TEXT PRIMARY KEY,
+                    channel_id TEXT,
+                    processed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            
+            # Knowledge
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS knowledge (
+                    id SERIAL PRIMARY KEY,
+                    category TEXT NOT NULL,
+                    content TEXT NOT NULL,
+                    source TEXT,
+                    metadata TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            
+            # Action history
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS action_history (
+                    id SERIAL PRIMARY KEY,
+                    action_id TEXT NOT NULL,
+                    action_type TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    reasoning TEXT,
+                    action_data TEXT,
+                    result TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+
+            # Sent reports
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS sent_reports (
+                    report_key TEXT PRIMARY KEY,
+                    sent_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            
+            # Project Context (New for full robustness)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS project_context (
+                    key TEXT PRIMARY KEY,
+                    content TEXT,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            
+            for statement in INDEX_STATEMENTS + POSTGRES_INDEX_STATEMENTS + POSTGRES_FTS_STATEMENTS:
+                cursor.execute(statement)
+            
+            # Optional: pg_trgm needs extension privileges, so don't let it abort init
+            cursor.execute('SAVEPOINT trgm')
+            try:
+                for statement in POSTGRES_TRGM_STATEMENTS:
+                    cursor.execute(statement)
+                cursor.execute('RELEASE SAVEPOINT trgm')
+            except psycopg2.Error as e:
+                cursor.execute('ROLLBACK TO SAVEPOINT trgm')
+                print(f"PG: pg_trgm unavailable, substring search stays unindexed: {e}")
 
     def add_processed_message(self, message_ts: str, channel_id: str = ""):
-        conn = self.get_connection()
         try:
-            with conn.cursor() as cursor:
-                cursor.execute(
-                    'INSERT INTO processed_messages (message_ts, channel_id) VALUES (%s, %s) ON CONFLICT DO NOTHING',
-                    (message_ts, channel_id)
-                )
-            conn.commit()
+            with self._cursor() as cursor:
+                self._execute_prepared(cursor, "mm_insert_processed", (message_ts, channel_id))
+            self._processed.add(message_ts)
         except Exception as e:
             print(f"PG: Error marking processed: {e}")
-        finally:
-            conn.close()
 
     def is_message_processed(self, message_ts: str) -> bool:
-        conn = self.get_connection()
-        try:
-            with conn.cursor() as cursor:
-                cursor.execute('SELECT 1 FROM processed_messages WHERE message_ts = %s', (message_ts,))
-                result = cursor.fetchone()
-            return result is not None
-        finally:
-            conn.close()
+        if message_ts in self._processed:
+            return True
+        with self._cursor() as cursor:
+            self._execute_prepared(cursor, "mm_is_processed", (message_ts,))
+            processed = cursor.fetchone()[0]
+        if processed:
+            self._processed.add(message_ts)
+        return processed
 
     def log_decision(self, action_type: str, approved: bool, reasoning: str, action_data: dict = None) -> int:
-        conn = self.get_connection()
-        try:
-            with conn.cursor() as cursor:
-                cursor.execute('''
-                    INSERT INTO decisions (action_type, approved, reasoning, action_data)
-                    VALUES (%s, %s, %s, %s) RETURNING id
-                ''', (action_type, 1 if approved else 0, reasoning, json.dumps(action_data) if action_data else None))
-                decision_id = cursor.fetchone()[0]
-            conn.commit()
-            return decision_id
-        finally:
-            conn.close()
+        with self._cursor() as cursor:
+            self._execute_prepared(
+                cursor, "mm_insert_decision",
+                (action_type, 1 if approved else 0, reasoning, _dump_json_text(action_data))
+            )
+            decision_id = cursor.fetchone()[0]
+        return decision_id
 
     def get_decision_history(self, action_type: str = None, limit: int = 10) -> List[Dict[str, Any]]:
-        conn = self.get_connection()
-        try:
-            with conn.cursor(cursor_factory=RealDictCursor) as cursor:
-                if action_type:
-                    cursor.execute('SELECT * FROM decisions WHERE action_type = %s ORDER BY created_at DESC LIMIT %s', (action_type, limit))
-                else:
-                    cursor.execute('SELECT * FROM decisions ORDER BY created_at DESC LIMIT %s', (limit,))
-                rows = cursor.fetchall()
-            return [dict(row) for row in rows]
-        finally:
-            conn.close()
+        with self._cursor(cursor_factory=RealDictCursor) as cursor:
+            if action_type:
+                cursor.execute('SELECT * FROM decisions WHERE action_type = %s ORDER BY created_at DESC LIMIT %s', (action_type, limit))
+            else:
+                cursor.execute('SELECT * FROM decisions ORDER BY created_at DESC LIMIT %s', (limit,))
+            rows = cursor.fetchall()
+        results = [dict(row) for row in rows]
+        for r in results:
+            if r.get('action_data'): r['action_data'] = orjson.loads(r['action_data'])
+        return results
+
+    def was_suggested_recently(self, content: str, days: int = 1) -> bool:
+        with self._cursor() as cursor:
+            self._execute_prepared(cursor, "mm_was_suggested", (content, int(days)))
+            return cursor.fetchone()[0]
+
+    def recently_suggested_contents(self, contents: List[str], days: int = 1) -> set:
+        if not contents:
+            return set()
+        with self._cursor() as cursor:
+            self._execute_prepared(cursor, "mm_suggested_contents", (list(contents), int(days)))
+            return {content for (content,) in cursor.fetchall()}
             
     def get_approval_rate(self, action_type: str = None) -> Dict[str, Any]:
-        conn = self.get_connection()
-        try:
-            with conn.cursor() as cursor:
-                if action_type:
-                    cursor.execute('SELECT COUNT(*), SUM(approved) FROM decisions WHERE action_type = %s', (action_type,))
-                else:
-                    cursor.execute('SELECT COUNT(*), SUM(approved) FROM decisions')
-                row = cursor.fetchone()
-            
-            total = row[0] or 0
-            approved = row[1] or 0
-            return {
-                "total": total, 
-                "approved": approved, 
-                "rejected": total - approved, 
-                "rate": round(approved / total * 100, 1) if total > 0 else 0
-            }
-        finally:
-            conn.close()
+        with self._cursor() as cursor:
+            if action_type:
+                cursor.execute('SELECT COUNT(*), SUM(approved) FROM decisions WHERE action_type = %s', (action_type,))
+            else:
+                cursor.execute('SELECT COUNT(*), SUM(approved) FROM decisions')
+            row = cursor.fetchone()
+        
+        total = row[0] or 0
+        approved = row[1] or 0
+        return {
+            "total": total, 
+            "approved": approved, 
+            "rejected": total - approved, 
+            "rate": round(approved / total * 100, 1) if total > 0 else 0
+        }
 
     def store_thread_context(self, thread_ts: str, channel_id: str, summary: str, entities: List[str] = None):
-        conn = self.get_connection()
-        try:
-            with conn.cursor() as cursor:
-                cursor.execute('''
-                    INSERT INTO thread_context (thread_ts, channel_id, summary, entities, updated_at)
-                    VALUES (%s, %s, %s, %s, CURRENT_TIMESTAMP)
-                    ON CONFLICT(thread_ts, channel_id) DO UPDATE SET
-                        summary = EXCLUDED.summary,
-                        entities = EXCLUDED.entities,
-                        updated_at = CURRENT_TIMESTAMP
-                ''', (thread_ts, channel_id, summary, json.dumps(entities) if entities else None))
-            conn.commit()
-        finally:
-            conn.close()
+        with self._cursor() as cursor:
+            self._execute_prepared(
+                cursor, "mm_upsert_thread", (thread_ts, channel_id, summary, _dump_json_text(entities))
+            )
 
     def get_thread_context(self, thread_ts: str, channel_id: str) -> Optional[Dict[str, Any]]:
-        conn = self.get_connection()
-        try:
-            with conn.cursor(cursor_factory=RealDictCursor) as cursor:
-                cursor.execute('SELECT * FROM thread_context WHERE thread_ts = %s AND channel_id = %s', (thread_ts, channel_id))
-                row = cursor.fetchone()
-            if row:
-                res = dict(row)
-                if res.get('entities'): res['entities'] = json.loads(res['entities'])
-                return res
-            return None
-        finally:
-            conn.close()
+        with self._cursor(cursor_factory=RealDictCursor) as cursor:
+            cursor.execute('SELECT * FROM thread_context WHERE thread_ts = %s AND channel_id = %s', (thread_ts, channel_id))
+            row = cursor.fetchone()
+        if row:
+            res = dict(row)
+            if res.get('entities'): res['entities'] = orjson.loads(res['entities'])
+            return res
+        return None
 
     def store_insight(self, category: str, content: str, source: str = None, metadata: dict = None):
-        conn = self.get_connection()
-        try:
-            with conn.cursor() as cursor:
-                cursor.execute('''
-                    INSERT INTO knowledge (category, content, source, metadata)
-                    VALUES (%s, %s, %s, %s)
-                ''', (category, content, source, json.dumps(metadata) if metadata else None))
-            conn.commit()
-        finally:
-            conn.close()
+        with self._cursor() as cursor:
+            self._execute_prepared(
+                cursor, "mm_insert_insight", (category, content, source, _dump_json_text(metadata))
+            )
+
+    def store_insights_bulk(self, rows: List[tuple]):
+        if not rows:
+            return
+        values = [(category, content, source, _dump_json_text(metadata))
+                  for category, content, source, metadata in rows]
+        with self._cursor() as cursor:
+            if len(values) > POSTGRES_COPY_THRESHOLD:
+                # Large batches: stream rows through the COPY fast path
+                buffer = io.StringIO()
+                for row in values:
+                    buffer.write("\t".join(_copy_field(field) for field in row) + "\n")
+                buffer.seek(0)
+                cursor.copy_expert(
+                    "COPY knowledge (category, content, source, metadata) FROM STDIN", buffer
+                )
+            else:
+                # One multi-row INSERT instead of a round-trip per insight
+                execute_values(
+                    cursor,
+                    "INSERT INTO knowledge (category, content, source, metadata) VALUES %s",
+                    values,
+                )
 
     def search_memory(self, query: str, category: str = None, limit: int = 5) -> List[Dict[str, Any]]:
-        conn = self.get_connection()
-        try:
-            with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+        with self._cursor(cursor_factory=RealDictCursor) as cursor:
+            rows = []
+            ts_query = _pg_tsquery(query)
+            if ts_query:
+                cursor.execute('''
+                    SELECT * FROM knowledge
+                    WHERE to_tsvector('english', content) @@ to_tsquery('english', %s)
+                      AND (%s IS NULL OR category = %s)
+                    ORDER BY ts_rank(to_tsvector('english', content), to_tsquery('english', %s)) DESC
+                    LIMIT %s
+                ''', (ts_query, category, category, ts_query, limit))
+                rows = cursor.fetchall()
+            # Punctuation-heavy terms (times, URLs) can tokenize away; fall back to a substring match
+            if not rows:
                 if category:
                     cursor.execute('SELECT * FROM knowledge WHERE category = %s AND content ILIKE %s ORDER BY created_at DESC LIMIT %s', (category, f'%{query}%', limit))
                 else:
                     cursor.execute('SELECT * FROM knowledge WHERE content ILIKE %s ORDER BY created_at DESC LIMIT %s', (f'%{query}%', limit))
                 rows = cursor.fetchall()
-            results = []
-            for row in rows:
-                r = dict(row)
-                if r.get('metadata'): r['metadata'] = json.loads(r['metadata'])
-                results.append(r)
-            return results
-        finally:
-            conn.close()
+        results = []
+        for row in rows:
+            r = dict(row)
+            if r.get('metadata'): r['metadata'] = orjson.loads(r['metadata'])
+            results.append(r)
+        return results
 
     def get_knowledge_by_category(self, category: str, limit: int = 20) -> List[Dict[str, Any]]:
-        conn = self.get_connection()
-        try:
-            with conn.cursor(cursor_factory=RealDictCursor) as cursor:
-                cursor.execute('SELECT * FROM knowledge WHERE category = %s ORDER BY created_at DESC LIMIT %s', (category, limit))
-                rows = cursor.fetchall()
-            return [dict(row) for row in rows]
-        finally:
-            conn.close()
+        with self._cursor(cursor_factory=RealDictCursor) as cursor:
+            cursor.execute('SELECT * FROM knowledge WHERE category = %s ORDER BY created_at DESC LIMIT %s', (category, limit))
+            rows = cursor.fetchall()
+        results = [dict(row) for row in rows]
+        for r in results:
+            if r.get('metadata'): r['metadata'] = orjson.loads(r['metadata'])
+        return results
 
     def log_action_execution(self, action_id: str, action_type: str, status: str, reasoning: str, action_data: dict = None, result: str = None):
-        conn = self.get_connection()
-        try:
-            with conn.cursor() as cursor:
-                cursor.execute('''
-                    INSERT INTO action_history (action_id, action_type, status, reasoning, action_data, result)
-                    VALUES (%s, %s, %s, %s, %s, %s)
-                ''', (action_id, action_type, status, reasoning, json.dumps(action_data) if action_data else None, result))
-            conn.commit()
-        finally:
-            conn.close()
+        with self._cursor() as cursor:
+            cursor.execute('''
+                INSERT INTO action_history (action_id, action_type, status, reasoning, action_data, result)
+                VALUES (%s, %s, %s, %s, %s, %s)
+            ''', (action_id, action_type, status, reasoning, _dump_json_text(action_data), result))
             
     def get_action_history(self, limit: int = 50, status: str = None) -> List[Dict[str, Any]]:
-        conn = self.get_connection()
-        try:
-            with conn.cursor(cursor_factory=RealDictCursor) as cursor:
-                if status:
-                    cursor.execute('SELECT * FROM action_history WHERE status = %s ORDER BY created_at DESC LIMIT %s', (status, limit))
-                else:
-                    cursor.execute('SELECT * FROM action_history ORDER BY created_at DESC LIMIT %s', (limit,))
-                rows = cursor.fetchall()
-            results = []
-            for row in rows:
-                r = dict(row)
-                if r.get('action_data'): r['action_data'] = json.loads(r['action_data'])
-                results.append(r)
-            return results
-        finally:
-            conn.close()
+        with self._cursor(cursor_factory=RealDictCursor) as cursor:
+            if status:
+                cursor.execute('SELECT * FROM action_history WHERE status = %s ORDER BY created_at DESC LIMIT %s', (status, limit))
+            else:
+                cursor.execute('SELECT * FROM action_history ORDER BY created_at DESC LIMIT %s', (limit,))
+            rows = cursor.fetchall()
+        results = []
+        for row in rows:
+            r = dict(row)
+            if r.get('action_data'): r['action_data'] = orjson.loads(r['action_data'])
+            results.append(r)
+        return results
+
+    def has_action_on(self, action_type: str, day: str, status: str = "SUCCESS") -> bool:
+        with self._cursor() as cursor:
+            self._execute_prepared(cursor, "mm_has_action_on", (action_type, status, day))
+            return cursor.fetchone()[0]
 
     def get_stats(self) -> Dict[str, Any]:
-        conn = self.get_connection()
-        try:
-            with conn.cursor() as cursor:
-                cursor.execute('SELECT COUNT(*) FROM decisions')
-                decisions = cursor.fetchone()[0]
-                cursor.execute('SELECT COUNT(*) FROM thread_context')
-                threads = cursor.fetchone()[0]
-                cursor.execute('SELECT COUNT(*) FROM knowledge')
-                knowledge = cursor.fetchone()[0]
-                cursor.execute('SELECT COUNT(*) FROM action_history')
-                actions = cursor.fetchone()[0]
-                cursor.execute("SELECT COUNT(*) FROM action_history WHERE status = 'SUCCESS'")
-                success = cursor.fetchone()[0]
-            
-            approval = self.get_approval_rate()
-            return {
-                "decisions": decisions,
-                "threads": threads,
-                "knowledge_entries": knowledge,
-                "total_actions": actions,
-                "successful_actions": success,
-                "approval_rate": approval["rate"]
-            }
-        finally:
-            conn.close()
+        """Table counts, cached for STATS_TTL_SECONDS."""
+        cached = self._stats_cache
+        if cached and time.monotonic() - cached[0] < STATS_TTL_SECONDS:
+            return dict(cached[1])
+        with self._cursor() as cursor:
+            # All counts in a single round-trip
+            cursor.execute('''
+                SELECT
+                    (SELECT COUNT(*) FROM decisions),
+                    (SELECT COUNT(*) FROM thread_context),
+                    (SELECT COUNT(*) FROM knowledge),
+                    (SELECT COUNT(*) FROM action_history),
+                    (SELECT COUNT(*) FROM action_history WHERE status = 'SUCCESS'),
+                    (SELECT COUNT(*) FROM decisions WHERE approved = 1)
+            ''')
+            decisions, threads, knowledge, actions, success, approved = cursor.fetchone()
+        
+        stats = {
+            "decisions": decisions,
+            "threads": threads,
+            "knowledge_entries": knowledge,
+            "total_actions": actions,
+            "successful_actions": success,
+            "approval_rate": round(approved / decisions * 100, 1) if decisions > 0 else 0
+        }
+        self._stats_cache = (time.monotonic(), stats)
+        return dict(stats)
+
+    def prune(self, days: int = PROCESSED_RETENTION_DAYS,
+              history_days: int = HISTORY_RETENTION_DAYS) -> int:
+        with self._cursor() as cursor:
+            cursor.execute("DELETE FROM processed_messages WHERE processed_at < NOW() - make_interval(days => %s)", (days,))
+            deleted = cursor.rowcount
+            for table in ('decisions', 'action_history'):
+                cursor.execute(f"DELETE FROM {table} WHERE created_at < NOW() - make_interval(days => %s)", (history_days,))
+                deleted += cursor.rowcount
+        return deleted
 
     def has_sent_report(self, report_key: str) -> bool:
-        conn = self.get_connection()
-        try:
-            with conn.cursor() as cursor:
-                cursor.execute('SELECT 1 FROM sent_reports WHERE report_key = %s', (report_key,))
-                return cursor.fetchone() is not None
-        finally:
-            conn.close()
+        with self._cursor() as cursor:
+            self._execute_prepared(cursor, "mm_has_sent_report", (report_key,))
+            return cursor.fetchone()[0]
 
     def mark_report_sent(self, report_key: str):
-        conn = self.get_connection()
-        try:
-            with conn.cursor() as cursor:
-                cursor.execute('INSERT INTO sent_reports (report_key) VALUES (%s) ON CONFLICT DO NOTHING', (report_key,))
-            conn.commit()
-        finally:
-            conn.close()
+        self.try_mark_report_sent(report_key)
+
+    def try_mark_report_sent(self, report_key: str) -> bool:
+        with self._cursor() as cursor:
+            self._execute_prepared(cursor, "mm_claim_report", (report_key,))
+            inserted = cursor.fetchone() is not None
+        return inserted
+
+    def release_report_claim(self, report_key: str):
+        with self._cursor() as cursor:
+            cursor.execute('DELETE FROM sent_reports WHERE report_key = %s', (report_key,))
             
     # New methods for Context Management (Professional Mode)
     def save_context(self, content: str):
-        conn = self.get_connection()
-        try:
-            with conn.cursor() as cursor:
-                cursor.execute('''
-                    INSERT INTO project_context (key, content, updated_at) 
-                    VALUES ('main', %s, CURRENT_TIMESTAMP)
-                    ON CONFLICT(key) DO UPDATE SET content = EXCLUDED.content, updated_at = CURRENT_TIMESTAMP
-                ''', (content,))
-            conn.commit()
-        finally:
-            conn.close()
+        with self._cursor() as cursor:
+            self._execute_prepared(cursor, "mm_save_context", (content,))
+            # Delivered on commit, so listeners never re-read the old row
+            cursor.execute(f"NOTIFY {CONTEXT_CHANNEL}")
+        self._ctx_cache = (time.monotonic(), content)
 
     def load_context(self) -> str:
-        conn = self.get_connection()
-        try:
-            with conn.cursor() as cursor:
-                cursor.execute("SELECT content FROM project_context WHERE key = 'main'")
-                row = cursor.fetchone()
-            return row[0] if row else ""
-        finally:
-            conn.close()
+        cached = self._ctx_cache
+        if cached and time.monotonic() - cached[0] < CONTEXT_TTL_SECONDS:
+            return cached[1]
+        with self._cursor() as cursor:
+            self._execute_prepared(cursor, "mm_load_context", ())
+            row = cursor.fetchone()
+        content = row[0] if row else ""
+        self._ctx_cache = (time.monotonic(), content)
+        return content
 
 # Singleton instance for easy import
 _memory_instance = None
+_memory_lock = threading.Lock()
 
 def get_memory_manager(db_path: str = None):
-    """Get or create the singleton MemoryManager instance."""
+    """Get or create the singleton MemoryManager instance (thread-safe)."""
     global _memory_instance
     if _memory_instance is None:
-        # Check for DATABASE_URL (Render Postgres)
-        db_url = os.environ.get('DATABASE_URL')
-        if db_url and POSTGRES_AVAILABLE:
-            print("🔌 Connecting to PostgreSQL Database...")
-            _memory_instance = PostgresMemoryManager(db_url)
-        else:
-            # Fallback to SQLite
-            _memory_instance = MemoryManager(db_path)
+        with _memory_lock:
+            # Re-check: another thread may have created it while we waited
+            if _memory_instance is None:
+                # Check for DATABASE_URL (Render Postgres)
+                db_url = os.environ.get('DATABASE_URL')
+                if db_url and POSTGRES_AVAILABLE:
+                    print("🔌 Connecting to PostgreSQL Database...")
+                    _memory_instance = PostgresMemoryManager(db_url)
+                else:
+                    # Fallback to SQLite
+                    _memory_instance = MemoryManager(db_path)
     return _memory_instance
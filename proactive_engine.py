@@ -5,13 +5,35 @@ Detects stale tasks, blockers, and generates automatic suggestions.
 
 import re
 import os
-import json
+import bisect
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
-import uuid
+from secrets import token_hex
 
 from memory_manager import MemoryManager, get_memory_manager
 
+# Optional: RE2 guarantees linear-time matching on arbitrary Slack text
+try:
+    import re2
+    RE2_AVAILABLE = True
+except ImportError:
+    RE2_AVAILABLE = False
+
+
+# RE2's \s is ASCII-only; Python's also matches Unicode spaces such as the
+# non-breaking space Slack clients insert. Widen it so results don't depend on the engine.
+_RE2_WHITESPACE = r'[\s\p{Z}\x85]'
+
+
+def _compile_scanner(pattern: str):
+    """
+    Case-insensitive pattern for scanning message text; RE2 when installed, else re.
+    A whitespace escape must not appear inside a character class (it is widened to one for RE2).
+    """
+    if RE2_AVAILABLE:
+        return re2.compile('(?i)' + pattern.replace(r'\s', _RE2_WHITESPACE))
+    return re.compile(pattern, re.IGNORECASE)
+
 
 class ProactiveEngine:
     """
@@ -24,8 +46,9 @@ class ProactiveEngine:
     - Suggest follow-up actions proactively
     """
     
-    # Patterns that indicate blockers
-    BLOCKER_PATTERNS = [
+    # Patterns that indicate blockers (compiled once at class load; case-insensitive,
+    # so messages are searched as-is and match offsets line up with the original text)
+    BLOCKER_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in [
         r'waiting\s+(on|for)\s+',
         r'blocked\s+(by|on)\s+',
         r'need\s+.*\s+before',
@@ -33,16 +56,44 @@ class ProactiveEngine:
         r'dependency\s+on',
         r'stuck\s+(on|at)',
         r'pending\s+(approval|review)',
-    ]
+    ])
+    # All blocker patterns as one alternation; group `p<i>` is BLOCKER_PATTERNS[i]
+    BLOCKER_REGEX = _compile_scanner('|'.join(
+        f'(?P<p{i}>{p.pattern})' for i, p in enumerate(BLOCKER_PATTERNS)
+    ))
     
-    # Keywords that suggest urgency
-    URGENCY_KEYWORDS = [
+    # context.md structure: `## ` section headers and [YYYY-MM-DD] dates.
+    # The two known sections are matched anywhere on a line, as before.
+    SECTION_HEADER_REGEX = re.compile(r'^(?:## .*|.*## (?:3\. Reminders|2\. Active Epics).*)$', re.M)
+    DATE_REGEX = re.compile(r'\[(\d{4})-(\d{2})-(\d{2})')
+    
+    # Keywords that suggest urgency (a tuple: order is the reported keyword order)
+    URGENCY_KEYWORDS = (
         'urgent', 'asap', 'critical', 'blocker', 'deadline', 
         'today', 'immediately', 'priority', 'p0', 'p1'
-    ]
+    )
+    # Single-pass, case-insensitive prefilter: matches iff some keyword is a substring
+    URGENCY_REGEX = _compile_scanner('|'.join(re.escape(kw) for kw in URGENCY_KEYWORDS))
+    # Every keyword occurrence in one pass, overlapping ones included ("asap1"):
+    # the lookahead matches empty, so the scan advances one character at a time.
+    # No keyword is a prefix of another, so each position yields at most one.
+    # (RE2 has no lookahead; the alternation is plain literals, so re is linear here.)
+    URGENCY_ALL_REGEX = re.compile(
+        '(?=(' + '|'.join(re.escape(kw) for kw in URGENCY_KEYWORDS) + '))', re.IGNORECASE
+    )
     
-    def __init__(self, memory: MemoryManager = None):
+    def __init__(self, memory: MemoryManager = None, client_manager=None):
         self.memory = memory or get_memory_manager()
+        # Pass the caller's ClientManager to share its client (and key rotation) across engines
+        self._client_manager = client_manager
+    
+    @property
+    def client_manager(self):
+        """The LLM ClientManager; created on first report if none was passed in."""
+        if self._client_manager is None:
+            from client_manager import ClientManager
+            self._client_manager = ClientManager()
+        return self._client_manager
     
     def check_stale_tasks(
         self, 
@@ -63,72 +114,50 @@ class ProactiveEngine:
         now = datetime.now()
         threshold_date = now - timedelta(days=days_threshold)
         
-        # Parse reminders section for old dates
-        lines = context_md.split('\n')
-        in_reminders = False
-        in_epics = False
-        
-        for line in lines:
-            if '## 3. Reminders' in line:
-                in_reminders = True
-                in_epics = False
-                continue
-            elif '## 2. Active Epics' in line:
-                in_epics = True
-                in_reminders = False
-                continue
-            elif line.startswith('## '):
-                in_reminders = False
-                in_epics = False
+        # Section headers, as (line start offset, is the Reminders section)
+        headers = [
+            (m.start(), '## 3. Reminders' in m.group())
+            for m in self.SECTION_HEADER_REGEX.finditer(context_md)
+        ]
+        header_starts = [start for start, _ in headers]
+        
+        # Scan the whole document for dates [YYYY-MM-DD] instead of line by line
+        last_line_start = -1
+        for date_match in self.DATE_REGEX.finditer(context_md):
+            line_start = context_md.rfind('\n', 0, date_match.start()) + 1
+            if line_start == last_line_start:
+                continue  # Only the first date on each line counts
+            last_line_start = line_start
+            
+            section = bisect.bisect_right(header_starts, line_start) - 1
+            if section >= 0 and header_starts[section] == line_start:
+                continue  # Dates on header lines are ignored
+            in_reminders = section >= 0 and headers[section][1]
+            
+            try:
+                item_date = datetime(*map(int, date_match.groups()))
+            except ValueError:
                 continue
             
-            # Look for date patterns [YYYY-MM-DD]
-            date_match = re.search(r'\[(\d{4}-\d{2}-\d{2})', line)
-            if date_match:
-                try:
-                    item_date = datetime.strptime(date_match.group(1), '%Y-%m-%d')
-                    
-                    # Check if this date is in the past
-                    if item_date < threshold_date:
-                        days_old = (now - item_date).days
-                        
-                        stale_items.append({
-                            "id": str(uuid.uuid4())[:8],
-                            "type": "stale_reminder" if in_reminders else "stale_task",
-                            "content": line.strip(),
-                            "date": date_match.group(1),
-                            "days_old": days_old,
-                            "suggested_action": f"Follow up on this item (last activity {days_old} days ago)",
-                            "action_type": "schedule_reminder",
-                            "priority": "high" if days_old > 7 else "medium"
-                        })
-                except ValueError:
-                    continue
+            # Check if this date is in the past
+            if item_date < threshold_date:
+                days_old = (now - item_date).days
+                line_end = context_md.find('\n', date_match.end())
+                line = context_md[line_start:line_end if line_end != -1 else len(context_md)]
+                
+                stale_items.append({
+                    "id": token_hex(4),
+                    "type": "stale_reminder" if in_reminders else "stale_task",
+                    "content": line.strip(),
+                    "date": date_match.group()[1:],
+                    "days_old": days_old,
+                    "suggested_action": f"Follow up on this item (last activity {days_old} days ago)",
+                    "action_type": "schedule_reminder",
+                    "priority": "high" if days_old > 7 else "medium"
+                })
         
         return stale_items
 
-    def _was_recently_suggested(self, content: str, days: int = 1) -> bool:
-        """Check if this content was suggesting in the last N days."""
-        # Get recent decisions from memory
-        recent_decisions = self.memory.get_decision_history(limit=50)
-        
-        cutoff = datetime.now() - timedelta(days=days)
-        
-        for decision in recent_decisions:
-            created_at = datetime.strptime(decision['created_at'], '%Y-%m-%d %H:%M:%S')
-            if created_at < cutoff:
-                continue
-                
-            # Check if data matches
-            if decision.get('action_data'):
-                try:
-                    data = json.loads(decision['action_data'])
-                    if data.get('original_content') == content:
-                        return True
-                except:
-                    pass
-        return False
-
     def detect_blockers(self, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         Scan messages for blocker patterns.
@@ -142,32 +171,40 @@ class ProactiveEngine:
         blockers = []
         
         for msg in messages:
-            text = msg.get('text', '')
-            text_lower = text.lower()
-            
-            for pattern in self.BLOCKER_PATTERNS:
-                match = re.search(pattern, text_lower)
-                if match:
-                    # Extract context around the blocker phrase
-                    start = max(0, match.start() - 20)
-                    end = min(len(text), match.end() + 50)
-                    context = text[start:end]
-                    
-                    blockers.append({
-                        "id": str(uuid.uuid4())[:8],
-                        "type": "blocker",
-                        "pattern_matched": pattern,
-                        "message_text": text[:200],  # Truncate
-                        "context": context,
-                        "timestamp": msg.get('ts'),
-                        "user": msg.get('user'),
-                        "suggested_action": "Address this blocker or follow up",
-                        "priority": "high"
-                    })
-                    break  # One blocker per message
+            text = msg.get('text')
+            if not text:
+                continue  # joins, file shares and other text-less events
+            blocker = self._match_blocker(msg, text)
+            if blocker:
+                blockers.append(blocker)
         
         return blockers
     
+    def _match_blocker(self, msg: Dict[str, Any], text: str) -> Optional[Dict[str, Any]]:
+        """Blocker item for one message, or None."""
+        # One pass per message; the earliest blocker phrase wins
+        match = self.BLOCKER_REGEX.search(text)
+        if not match:
+            return None
+        pattern = self.BLOCKER_PATTERNS[int(match.lastgroup[1:])]
+        
+        # Extract context around the blocker phrase
+        start = max(0, match.start() - 20)
+        end = min(len(text), match.end() + 50)
+        context = text[start:end]
+        
+        return {
+            "id": token_hex(4),
+            "type": "blocker",
+            "pattern_matched": pattern.pattern,
+            "message_text": text[:200],  # Truncate
+            "context": context,
+            "timestamp": msg.get('ts'),
+            "user": msg.get('user'),
+            "suggested_action": "Address this blocker or follow up",
+            "priority": "high"
+        }
+    
     def detect_urgency(self, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         Detect messages with urgency indicators.
@@ -181,24 +218,36 @@ class ProactiveEngine:
         urgent_items = []
         
         for msg in messages:
-            text = msg.get('text', '')
-            text_lower = text.lower()
-            
-            matched_keywords = [kw for kw in self.URGENCY_KEYWORDS if kw in text_lower]
-            
-            if matched_keywords:
-                urgent_items.append({
-                    "id": str(uuid.uuid4())[:8],
-                    "type": "urgent",
-                    "keywords": matched_keywords,
-                    "message_text": text[:200],
-                    "timestamp": msg.get('ts'),
-                    "user": msg.get('user'),
-                    "priority": "critical" if 'p0' in matched_keywords or 'blocker' in matched_keywords else "high"
-                })
+            text = msg.get('text')
+            if not text:
+                continue
+            urgent = self._match_urgency(msg, text)
+            if urgent:
+                urgent_items.append(urgent)
         
         return urgent_items
     
+    def _match_urgency(self, msg: Dict[str, Any], text: str) -> Optional[Dict[str, Any]]:
+        """Urgent item for one message, or None."""
+        # Most messages match nothing; reject them in one C-level scan
+        if not self.URGENCY_REGEX.search(text):
+            return None
+        
+        found = {m.group(1).lower() for m in self.URGENCY_ALL_REGEX.finditer(text)}
+        matched_keywords = [kw for kw in self.URGENCY_KEYWORDS if kw in found]
+        if not matched_keywords:
+            return None
+        
+        return {
+            "id": token_hex(4),
+            "type": "urgent",
+            "keywords": matched_keywords,
+            "message_text": text[:200],
+            "timestamp": msg.get('ts'),
+            "user": msg.get('user'),
+            "priority": "critical" if 'p0' in matched_keywords or 'blocker' in matched_keywords else "high"
+        }
+    
     def generate_status_report(self, context_text: str, period: str = "weekly", custom_directive: str = "") -> Dict[str, Any]:
         """
         Generates a status report by asking the LLM to summarize the context.
@@ -206,11 +255,7 @@ class ProactiveEngine:
         current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         
         # We need the client to generate content
-        from client_manager import ClientManager
-        from google.genai import types
-        
-        cm = ClientManager()
-        client = cm.get_client()
+        client = self.client_manager.get_client()
         
         prompt = f"""You are The Real PM. 
         Task: Generate a high-quality {period} status report for the team.
@@ -277,11 +322,20 @@ class ProactiveEngine:
         """
         suggestions = []
         
-        # Check for stale tasks
         stale_tasks = self.check_stale_tasks(context_md)
+        blockers = self.detect_blockers(messages) if messages else []
+        
+        # Skip anything suggested recently to avoid spam; one lookup for all candidates
+        already_suggested = self.memory.recently_suggested_contents(
+            [task["content"] for task in stale_tasks] + [blocker["message_text"] for blocker in blockers]
+        ) if stale_tasks or blockers else set()
+        
+        # One timestamp for the whole batch
+        created_at = datetime.now().isoformat()
+        
+        # Check for stale tasks
         for task in stale_tasks:
-            # Check if recently suggested to avoid spam
-            if self._was_recently_suggested(task["content"]):
+            if task["content"] in already_suggested:
                 continue
                 
             suggestions.append({
@@ -289,7 +343,7 @@ class ProactiveEngine:
                 "action_type": "proactive_followup",
                 "reasoning": f"🔔 Stale item detected: {task['content'][:100]}",
                 "status": "PENDING",
-                "created_at": datetime.now().isoformat(),
+                "created_at": created_at,
                 "data": {
                     "source": "stale_task_detection",
                     "days_old": task["days_old"],
@@ -302,37 +356,34 @@ class ProactiveEngine:
             })
         
         # Check for blockers in messages
-        if messages:
-            blockers = self.detect_blockers(messages)
-            for blocker in blockers:
-                # Check if recently suggested to avoid spam
-                if self._was_recently_suggested(blocker["message_text"]):
-                    continue
-                    
-                suggestions.append({
-                    "id": f"proactive-{blocker['id']}",
-                    "action_type": "proactive_blocker_alert",
-                    "reasoning": f"🚨 Blocker detected: {blocker['context']}",
-                    "status": "PENDING",
-                    "created_at": datetime.now().isoformat(),
-                    "data": {
-                        "source": "blocker_detection",
-                        "message_text": blocker["message_text"],
-                        "pattern": blocker["pattern_matched"]
-                    },
-                    "is_proactive": True,
-                    "priority": "high",
-                    "confidence": 0.9
-                })
+        for blocker in blockers:
+            if blocker["message_text"] in already_suggested:
+                continue
+                
+            suggestions.append({
+                "id": f"proactive-{blocker['id']}",
+                "action_type": "proactive_blocker_alert",
+                "reasoning": f"🚨 Blocker detected: {blocker['context']}",
+                "status": "PENDING",
+                "created_at": created_at,
+                "data": {
+                    "source": "blocker_detection",
+                    "message_text": blocker["message_text"],
+                    "pattern": blocker["pattern_matched"]
+                },
+                "is_proactive": True,
+                "priority": "high",
+                "confidence": 0.9
+            })
         
         # Store insights for learning
-        for suggestion in suggestions:
-            self.memory.store_insight(
-                category="proactive_suggestion",
-                content=suggestion["reasoning"],
-                source=f"proactive_engine:{suggestion['action_type']}",
-                metadata={"priority": suggestion.get("priority")}
-            )
+        if suggestions:
+            self.memory.store_insights_bulk([
+                ("proactive_suggestion", suggestion["reasoning"],
+                 f"proactive_engine:{suggestion['action_type']}",
+                 {"priority": suggestion.get("priority")})
+                for suggestion in suggestions
+            ])
         
         return suggestions
     
@@ -354,19 +405,8 @@ class ProactiveEngine:
         if now.hour < 16:
             return False
             
-        # Check if report was already sent today
-        recent_actions = self.memory.get_action_history(
-            limit=10, 
-            status="SUCCESS"
-        )
-        
-        today = now.strftime('%Y-%m-%d')
-        for action in recent_actions:
-            if action.get('action_type') == 'weekly_report':
-                if today in action.get('created_at', ''):
-                    return False
-        
-        return True
+        # Check if report was already sent today (indexed lookup)
+        return not self.memory.has_action_on('weekly_report', now.strftime('%Y-%m-%d'))
 
 
 def run_proactive_check(context_md: str, messages: List[Dict] = None) -> List[Dict]:
@@ -3,27 +3,16 @@ Slack Polls - Create interactive polls in Slack channels.
 Uses emoji reactions for voting.
 """
 
-import os
-import ssl
-import certifi
-from slack_sdk import WebClient
 from slack_sdk.errors import SlackApiError
 from typing import List, Dict, Any
 
-
-def get_slack_client():
-    """Initializes and returns a Slack WebClient."""
-    token = os.environ.get("SLACK_BOT_TOKEN")
-    if not token:
-        print("Warning: SLACK_BOT_TOKEN not found in environment variables.")
-        return None
-    
-    ssl_context = ssl.create_default_context(cafile=certifi.where())
-    return WebClient(token=token, ssl=ssl_context)
+from slack_tools import get_slack_client
 
 
 # Emoji numbers for poll options
 POLL_EMOJIS = ["one", "two", "three", "four", "five", "six", "seven", "eight", "nine", "keycap_ten"]
+# Reverse lookup: emoji name -> option index
+_EMOJI_TO_INDEX = {name: i for i, name in enumerate(POLL_EMOJIS)}
 
 
 def post_slack_poll(
@@ -151,14 +140,15 @@ def get_poll_results(channel_id: str, message_ts: str) -> Dict[str, Any]:
         results = {}
         for reaction in reactions:
             name = reaction["name"]
-            if name in POLL_EMOJIS:
-                # Subtract 1 for the bot's initial reaction
-                count = reaction["count"] - 1
-                option_index = POLL_EMOJIS.index(name)
-                results[f"option_{option_index + 1}"] = {
-                    "emoji": name,
-                    "votes": max(0, count)
-                }
+            option_index = _EMOJI_TO_INDEX.get(name)
+            if option_index is None:
+                continue
+            # Subtract 1 for the bot's initial reaction
+            count = reaction["count"] - 1
+            results[f"option_{option_index + 1}"] = {
+                "emoji": name,
+                "votes": max(0, count)
+            }
         
         return {
             "success": True,
@@ -1,3 +1,4 @@
+import io
 import os
 import json
 from google.genai import types
@@ -59,6 +60,38 @@ Markdown Content:
             text = text[:-3]
         return json.loads(text.strip())
 
+def _is_section_header(line):
+    """True for markdown `## ` section header lines (not `###` subsections)."""
+    return line.startswith("##") and len(line) > 2 and line[2].isspace()
+
+def _find_section(content, section_title):
+    """
+    Locates a `## <section_title>` section with a single pass over the lines.
+    
+    Returns:
+        (header_end, body_end) offsets into content: content[:header_end] is
+        everything up to and including the header line (and any blank lines
+        after it), content[header_end:body_end] is the section body, and
+        content[body_end:] starts with the newline before the next `## `
+        header (or is empty at EOF). None if the section is not found.
+    """
+    offset = 0
+    header_end = None
+    # StringIO splits on "\n" only and keeps it, so offsets line up with content
+    for line in io.StringIO(content):
+        start, offset = offset, offset + len(line)
+        if header_end is None:
+            if _is_section_header(line) and line.endswith("\n") and line[2:].strip() == section_title:
+                header_end = offset
+        elif start == header_end and not line.strip() and line.endswith("\n"):
+            # Blank lines right after the header stay with the header
+            header_end = offset
+        elif _is_section_header(line):
+            return header_end, max(header_end, start - 1)
+    if header_end is None:
+        return None
+    return header_end, len(content)
+
 def update_section(section_title, new_content, append=False):
     """
     Updates a specific section in context.md (DB or File).
@@ -72,37 +105,29 @@ def update_section(section_title, new_content, append=False):
     Raises:
         ValueError: If the section header is not found.
     """
-    import re
-    
     content = read_context()
     if not content:
         raise ValueError("Context is empty or not found.")
         
-    # Escape the title to handle any special regex characters
-    escaped_title = re.escape(section_title)
-    
-    # Pattern to find the header and its content up to the next header or EOF
-    # Group 1: The header line (e.g., "## 1. Critical Status\n")
-    # Group 2: The content of the section
-    pattern = rf"(##\s+{escaped_title}\s*\n)(.*?)(?=\n##\s+|\Z)"
-    
-    match = re.search(pattern, content, flags=re.DOTALL)
+    # Find the header and its content up to the next header or EOF
+    section = _find_section(content, section_title)
     
-    if not match:
+    if not section:
         raise ValueError(f"Section '{section_title}' not found in context.")
+    header_end, body_end = section
     
     # Construct the new content
     if append:
         # Append to existing content
-        existing_content = match.group(2).rstrip()
+        existing_content = content[header_end:body_end].rstrip()
         clean_new_content = existing_content + "\n" + new_content.strip() + "\n"
     else:
         # Replace existing content
         clean_new_content = new_content.strip()
         
         # Check if the new content accidentally includes the header itself
-        # match.group(1) is like "## 2. Active Epics & Tasks\n"
-        header_text = match.group(1).strip()
+        # The header is like "## 2. Active Epics & Tasks\n"
+        header_text = content[:header_end].rstrip().rsplit("\n", 1)[-1].strip()
         if clean_new_content.startswith(header_text):
             # Remove the header from the new content to avoid duplication
             clean_new_content = clean_new_content[len(header_text):].strip()
@@ -110,9 +135,9 @@ def update_section(section_title, new_content, append=False):
         clean_new_content = clean_new_content + "\n"
     
     # Reconstruct the file content
-    # content[:match.end(1)] includes the header
-    # content[match.end(2):] is the rest of the file starting from the next header (or empty if EOF)
-    updated_file_content = content[:match.end(1)] + clean_new_content + content[match.end(2):]
+    # content[:header_end] includes the header
+    # content[body_end:] is the rest of the file starting from the next header (or empty if EOF)
+    updated_file_content = content[:header_end] + clean_new_content + content[body_end:]
     
     write_context(updated_file_content)
 
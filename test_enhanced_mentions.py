@@ -9,8 +9,9 @@ This script tests the ability to find messages containing:
 """
 
 import os
+from itertools import chain
 from dotenv import load_dotenv
-from slack_tools import get_messages_mentions
+from slack_tools import get_messages_mentions, get_messages_mentions_multi
 
 # Load environment variables
 load_dotenv()
@@ -86,23 +87,21 @@ def test_mention_detection():
     print(f"\n\n🔍 Test 4: Combined detection (bot mentions + keywords + user mentions)")
     print("-" * 80)
     try:
-        bot_with_keywords = get_messages_mentions(
-            test_channel, 
-            bot_user_id, 
-            days=1, 
-            debug=False,
-            include_keywords=["mohit", "the real pm"]
-        )
-        
-        user_mentions = get_messages_mentions(
-            test_channel,
-            user_id,
-            days=1,
-            debug=False
-        )
+        # Both lookups are independent; fetch them concurrently
+        bot_with_keywords, user_mentions = get_messages_mentions_multi([
+            dict(channel_id=test_channel, user_id=bot_user_id, days=1, debug=False,
+                 include_keywords=["mohit", "the real pm"]),
+            dict(channel_id=test_channel, user_id=user_id, days=1, debug=False),
+        ])
         
-        # Combine and deduplicate
-        all_mentions = {msg.get('ts'): msg for msg in (bot_with_keywords + user_mentions)}
+        # Combine and deduplicate by timestamp, keeping first-seen order
+        seen = set()
+        all_mentions = []
+        for msg in chain(bot_with_keywords, user_mentions):
+            ts = msg.get('ts')
+            if ts not in seen:
+                seen.add(ts)
+                all_mentions.append(msg)
         
         print(f"\n✓ Total unique messages found: {len(all_mentions)}")
         print(f"   - Bot mentions + keywords: {len(bot_with_keywords)}")
@@ -110,7 +109,7 @@ def test_mention_detection():
         print(f"   - Combined (deduplicated): {len(all_mentions)}")
         
         print("\n📝 Sample messages:")
-        for i, msg in enumerate(list(all_mentions.values())[:5], 1):
+        for i, msg in enumerate(all_mentions[:5], 1):
             text = msg.get('text', '')
             sender = msg.get('user', 'unknown')
             print(f"   {i}. [{sender}] {text[:100]}...")
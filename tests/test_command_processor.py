@@ -0,0 +1,41 @@
+"""
+Tests for Command Processor module.
+"""
+
+from command_processor import looks_like_command
+
+
+class TestLooksLikeCommand:
+    """Tests for the cheap mention pre-filter."""
+
+    def test_acknowledgements_are_skipped(self):
+        """Test that short acknowledgements are not escalated."""
+        assert not looks_like_command("thanks")
+        assert not looks_like_command("<@U123ABC> thanks!")
+        assert not looks_like_command(":+1:")
+        assert not looks_like_command("")
+        assert not looks_like_command("ok")
+        assert not looks_like_command("Ok, got it :thumbsup:")
+        assert not looks_like_command("thank you so much!")
+
+    def test_reminder_is_escalated(self):
+        """Test that reminder commands pass the filter."""
+        assert looks_like_command("<@U123ABC> remind <@U456DEF> tomorrow 10am to ship the beta")
+
+    def test_question_is_escalated(self):
+        """Test that questions pass the filter."""
+        assert looks_like_command("<@U123ABC> where are we on the homepage?")
+
+    def test_unlisted_verbs_are_escalated(self):
+        """Test that commands are not dropped for lacking a known verb."""
+        commands = [
+            "ping Pravin about the release tomorrow",
+            "add a task: fix login bug",
+            "create a task for QA",
+            "follow up with design team on mocks",
+            "check with Umang on the beta build",
+            "nudge <@U2> at 5pm",
+            "move his tasks to Ravi",
+        ]
+        for command in commands:
+            assert looks_like_command(command), command
@@ -3,8 +3,13 @@ Tests for Memory Manager module.
 """
 
 import os
+import sqlite3
 import tempfile
+import threading
+from contextlib import contextmanager
+import time
 import pytest
+import memory_manager
 from memory_manager import MemoryManager
 
 
@@ -13,7 +18,9 @@ def memory():
     """Create a temporary memory manager for testing."""
     with tempfile.TemporaryDirectory() as tmpdir:
         db_path = os.path.join(tmpdir, "test_pm_agent.db")
-        yield MemoryManager(db_path)
+        manager = MemoryManager(db_path)
+        yield manager
+        manager.close()
 
 
 class TestDecisions:
@@ -56,6 +63,40 @@ class TestDecisions:
         reminder_history = memory.get_decision_history(action_type="schedule_reminder")
         assert len(reminder_history) == 2
     
+    def test_decision_history_decodes_action_data(self, memory):
+        """Test that action_data comes back decoded, not as raw JSON bytes."""
+        memory.log_decision("proactive_followup", False, "Stale task",
+                            action_data={"original_content": "abc"})
+        
+        history = memory.get_decision_history(limit=1)
+        assert history[0]["action_data"] == {"original_content": "abc"}
+    
+    def test_was_suggested_recently(self, memory):
+        """Test the original_content lookup used to suppress repeat suggestions."""
+        memory.log_decision("proactive_followup", False, "Stale task",
+                            action_data={"original_content": "Ship the beta"})
+        
+        assert memory.was_suggested_recently("Ship the beta")
+        assert not memory.was_suggested_recently("Ship the release")
+        
+        # Older than the window
+        with memory._write_pool.acquire() as conn:
+            conn.execute("UPDATE decisions SET created_at = datetime('now', '-3 days')")
+        assert not memory.was_suggested_recently("Ship the beta", days=1)
+        assert memory.was_suggested_recently("Ship the beta", days=7)
+    
+    def test_recently_suggested_contents(self, memory):
+        """Test the batched lookup returns only contents with a recent decision."""
+        memory.log_decision("proactive_followup", True, "Stale task",
+                            action_data={"original_content": "Ship the beta"})
+        memory.log_decision("proactive_blocker_alert", False, "Blocker",
+                            action_data={"original_content": "Blocked by vendor"})
+        
+        found = memory.recently_suggested_contents(["Ship the beta", "Blocked by vendor", "New item"])
+        
+        assert found == {"Ship the beta", "Blocked by vendor"}
+        assert memory.recently_suggested_contents([]) == set()
+    
     def test_approval_rate(self, memory):
         """Test approval rate calculation."""
         # Log mixed decisions
@@ -128,6 +169,20 @@ class TestKnowledge:
         assert len(results) == 1
         assert "Mohit" in results[0]["content"]
     
+    def test_store_insights_bulk(self, memory):
+        """Test storing several insights in one call."""
+        memory.store_insights_bulk([
+            ("proactive_suggestion", "Stale item: homepage copy", "proactive_engine:followup", {"priority": "high"}),
+            ("proactive_suggestion", "Blocker: staging down", "proactive_engine:blocker", None),
+        ])
+        
+        results = memory.get_knowledge_by_category("proactive_suggestion")
+        assert len(results) == 2
+        assert {r["content"] for r in results} == {"Stale item: homepage copy", "Blocker: staging down"}
+        metadata = {r["content"]: r["metadata"] for r in results}
+        assert metadata["Stale item: homepage copy"] == {"priority": "high"}
+        assert metadata["Blocker: staging down"] is None
+    
     def test_search_memory(self, memory):
         """Test searching through knowledge."""
         memory.store_insight("project_fact", "Homepage redesign due date is Jan 15")
@@ -142,6 +197,14 @@ class TestKnowledge:
         results = memory.search_memory("10", category="team_pattern")
         assert len(results) == 1
     
+    def test_search_memory_prefix_and_special_chars(self, memory):
+        """Test that search terms are prefix-matched and quotes are escaped."""
+        memory.store_insight("project_fact", "Homepage redesign due date is Jan 15")
+        
+        assert len(memory.search_memory("home")) == 1
+        assert len(memory.search_memory('redesign "due')) == 1
+        assert len(memory.search_memory("payments")) == 0
+    
     def test_get_knowledge_by_category(self, memory):
         """Test getting all knowledge in a category."""
         memory.store_insight("blocker_pattern", "External API timeouts")
@@ -170,7 +233,36 @@ class TestActionHistory:
         assert len(history) == 1
         assert history[0]["action_id"] == "action-123"
         assert history[0]["status"] == "SUCCESS"
-    
+        assert history[0]["action_data"] == {"channel": "C123", "time": "2025-12-08T10:00:00"}
+
+    def test_action_data_stored_as_blob(self, memory):
+        """Test that JSON payloads are stored as BLOBs and legacy TEXT rows still decode."""
+        memory.log_action_execution("a1", "reminder", "SUCCESS", "r1", action_data={"n": 1})
+        memory.flush()
+        with memory._write_pool.acquire() as conn:
+            stored_type = conn.execute('SELECT typeof(action_data) FROM action_history').fetchone()[0]
+            conn.execute(
+                'INSERT INTO action_history (action_id, action_type, status, reasoning, action_data) '
+                'VALUES (?, ?, ?, ?, ?)',
+                ("a0", "reminder", "SUCCESS", "legacy", '{"n": 0}')
+            )
+
+        assert stored_type == "blob"
+        assert sorted(a["action_data"]["n"] for a in memory.get_action_history()) == [0, 1]
+
+    def test_has_action_on(self, memory):
+        """Test the per-day action lookup used by the weekly report check."""
+        memory.log_action_execution("w1", "weekly_report", "SUCCESS", "sent")
+        memory.log_action_execution("w2", "weekly_report", "PENDING", "queued")
+        memory.flush()
+        with memory._write_pool.acquire() as conn:
+            conn.execute("UPDATE action_history SET created_at = '2025-12-05 16:30:00'")
+        
+        assert memory.has_action_on("weekly_report", "2025-12-05")
+        assert not memory.has_action_on("weekly_report", "2025-12-06")
+        assert not memory.has_action_on("daily_status", "2025-12-05")
+        assert not memory.has_action_on("weekly_report", "2025-12-05", status="FAILED")
+
     def test_filter_by_status(self, memory):
         """Test filtering action history by status."""
         memory.log_action_execution("a1", "reminder", "SUCCESS", "r1")
@@ -201,3 +293,229 @@ class TestStats:
         assert stats["total_actions"] == 1
         assert stats["successful_actions"] == 1
         assert stats["approval_rate"] == 50.0
+    
+    def test_stats_cache_invalidated_by_writes(self, memory):
+        """Test that cached stats are refreshed after a write."""
+        memory.log_decision("test", True, "r1")
+        assert memory.get_stats()["decisions"] == 1
+        assert memory.get_stats()["decisions"] == 1
+        
+        memory.log_decision("test", False, "r2")
+        memory.log_action_execution("a1", "type", "SUCCESS", "r")
+        stats = memory.get_stats()
+        
+        assert stats["decisions"] == 2
+        assert stats["total_actions"] == 1
+
+
+class TestConnectionSettings:
+    """Tests for SQLite connection tuning."""
+    
+    def test_wal_mode_enabled(self, memory):
+        """Test that the database uses write-ahead logging."""
+        conn = memory._connect()
+        mode = conn.execute('PRAGMA journal_mode').fetchone()[0]
+        conn.close()
+        
+        assert mode == "wal"
+    
+    def test_schema_version_skips_reinit(self, memory):
+        """Test that reopening a current database keeps search working."""
+        memory.store_insight("project_fact", "Launch checklist approved")
+        
+        reopened = MemoryManager(memory.db_path)
+        with reopened._read_pool.acquire() as conn:
+            version = conn.execute('PRAGMA user_version').fetchone()[0]
+        
+        assert version == memory_manager.SCHEMA_VERSION
+        assert len(reopened.search_memory("checklist")) == 1
+        reopened.close()
+    
+    def test_pooled_connections_across_threads(self, memory):
+        """Test that pooled connections can be shared between threads."""
+        def worker(n):
+            memory.log_decision("threaded", True, f"Decision {n}")
+            memory.get_decision_history(limit=5)
+        
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        
+        assert memory.get_approval_rate("threaded")["total"] == 8
+
+
+class TestProcessedMessages:
+    """Tests for buffered processed-message tracking."""
+    
+    def test_pending_message_is_processed(self, memory):
+        """Test that a buffered message is reported as processed before flushing."""
+        memory.add_processed_message("1700000000.000100", "C123")
+        
+        assert memory.is_message_processed("1700000000.000100")
+        assert not memory.is_message_processed("1700000000.000200")
+    
+    def test_flush_persists_messages(self, memory):
+        """Test that flushed messages are visible to a fresh manager."""
+        for i in range(5):
+            memory.add_processed_message(f"1700000000.00{i}", "C123")
+        memory.flush()
+        
+        reopened = MemoryManager(memory.db_path)
+        assert reopened.is_message_processed("1700000000.003")
+        reopened.close()
+
+
+class TestWriterThread:
+    """Tests for the single writer thread."""
+    
+    def test_concurrent_writes_get_unique_ids(self, memory):
+        """Test that writes from many threads are serialized and all committed."""
+        ids = []
+        
+        def worker(n):
+            ids.append(memory.log_decision("reminder", n % 2 == 0, f"r{n}"))
+        
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        
+        assert sorted(ids) == list(range(1, 9))
+        assert memory.get_stats()["decisions"] == 8
+    
+    def test_buffered_rows_flush_without_explicit_flush(self, memory):
+        """Test that the writer thread commits buffered rows on its own."""
+        memory.add_processed_message("1234.5678", "C123")
+        time.sleep(memory_manager.FLUSH_INTERVAL_SECONDS * 4)
+        
+        with memory._read_pool.acquire() as conn:
+            count = conn.execute('SELECT COUNT(*) FROM processed_messages').fetchone()[0]
+        assert count == 1
+
+    
+    def test_failed_commit_keeps_buffered_rows(self, memory, monkeypatch):
+        """Test that rows from a batch whose COMMIT fails are retried, not dropped."""
+        real_acquire = memory._write_pool.acquire
+        
+        class FailingCommit:
+            def __init__(self, conn):
+                self._conn = conn
+            def execute(self, sql, *args):
+                if sql == 'COMMIT':
+                    raise sqlite3.OperationalError("database is locked")
+                return self._conn.execute(sql, *args)
+            def __getattr__(self, name):
+                return getattr(self._conn, name)
+        
+        @contextmanager
+        def failing_acquire():
+            with real_acquire() as conn:
+                yield FailingCommit(conn)
+        
+        monkeypatch.setattr(memory._write_pool, "acquire", failing_acquire)
+        memory.add_processed_message("1111.0001", "C123")
+        memory.log_action_execution("a1", "reminder", "SUCCESS", "r1")
+        with pytest.raises(sqlite3.OperationalError):
+            memory.flush()
+        
+        monkeypatch.setattr(memory._write_pool, "acquire", real_acquire)
+        memory.flush()
+        
+        with memory._read_pool.acquire() as conn:
+            assert conn.execute('SELECT message_ts FROM processed_messages').fetchall() == [("1111.0001",)]
+        assert [a["action_id"] for a in memory.get_action_history()] == ["a1"]
+
+class TestSentReports:
+    """Tests for report de-duplication."""
+    
+    def test_mark_and_check_report(self, memory):
+        """Test that a report is only reported as sent after marking it."""
+        assert memory.has_sent_report("daily_morning_2025-12-10") is False
+        
+        memory.mark_report_sent("daily_morning_2025-12-10")
+        
+        assert memory.has_sent_report("daily_morning_2025-12-10") is True
+    
+    def test_try_mark_report_sent_only_once(self, memory):
+        """Test that only the first claim on a report key succeeds."""
+        assert memory.try_mark_report_sent("daily_evening_2025-12-10") is True
+        assert memory.try_mark_report_sent("daily_evening_2025-12-10") is False
+        assert memory.has_sent_report("daily_evening_2025-12-10") is True
+    
+    def test_release_report_claim(self, memory):
+        """Test that a released claim can be taken again."""
+        assert memory.try_mark_report_sent("weekly_report_2025-12-12") is True
+        memory.release_report_claim("weekly_report_2025-12-12")
+        
+        assert memory.has_sent_report("weekly_report_2025-12-12") is False
+        assert memory.try_mark_report_sent("weekly_report_2025-12-12") is True
+    
+    def test_sent_report_visible_to_new_instance(self, memory):
+        """Test that the in-memory cache does not hide reports sent by another instance."""
+        other = MemoryManager(memory.db_path)
+        assert memory.has_sent_report("weekly_2025-12-12") is False
+        
+        assert other.try_mark_report_sent("weekly_2025-12-12") is True
+        
+        assert memory.has_sent_report("weekly_2025-12-12") is True
+        assert memory.try_mark_report_sent("weekly_2025-12-12") is False
+        other.close()
+
+
+class TestRetention:
+    """Tests for pruning old rows."""
+    
+    def test_prune_removes_old_rows(self, memory):
+        """Test that rows outside the retention window are deleted."""
+        memory.add_processed_message("old.1")
+        memory.add_processed_message("new.1")
+        memory.log_action_execution("a1", "reminder", "SUCCESS", "r1")
+        memory.flush()
+        with memory._write_pool.acquire() as conn:
+            conn.execute("UPDATE processed_messages SET processed_at = datetime('now', '-40 days') WHERE message_ts = 'old.1'")
+            conn.execute("UPDATE action_history SET created_at = datetime('now', '-100 days')")
+        
+        assert memory.prune() == 2
+        assert memory.get_stats()["total_actions"] == 0
+        with memory._read_pool.acquire() as conn:
+            remaining = [r[0] for r in conn.execute('SELECT message_ts FROM processed_messages')]
+        assert remaining == ["new.1"]
+        assert not memory.is_message_processed("old.1")
+        assert memory.is_message_processed("new.1")
+    
+    def test_prune_empties_freelist(self, memory):
+        """Test that prune() returns every freed page to the filesystem."""
+        for i in range(500):
+            memory.log_action_execution(f"a{i}", "reminder", "SUCCESS", "x" * 500)
+        memory.flush()
+        with memory._write_pool.acquire() as conn:
+            conn.execute("UPDATE action_history SET created_at = datetime('now', '-100 days')")
+        
+        assert memory.prune() == 500
+        with memory._read_pool.acquire() as conn:
+            assert conn.execute('PRAGMA freelist_count').fetchone()[0] == 0
+    
+    def test_new_database_uses_incremental_vacuum(self, memory):
+        """Test that new databases are created with incremental auto_vacuum."""
+        with memory._read_pool.acquire() as conn:
+            assert conn.execute('PRAGMA auto_vacuum').fetchone()[0] == 2
+
+
+class TestProjectContext:
+    """Tests for the file-based project context."""
+    
+    def test_save_and_load_context(self, memory, monkeypatch, tmp_path):
+        """Test that context round-trips in place, keeping the same file (inode)."""
+        monkeypatch.setenv("PERSISTENT_DATA_PATH", str(tmp_path))
+        assert memory.load_context() == ""
+        
+        memory.save_context("# Project\n- [ ] Ship beta")
+        inode = os.stat(tmp_path / "context.md").st_ino
+        memory.save_context("# Project\n- [x] Ship beta")
+        
+        assert memory.load_context() == "# Project\n- [x] Ship beta"
+        assert os.stat(tmp_path / "context.md").st_ino == inode
+        assert os.listdir(tmp_path) == ["context.md"]
@@ -16,7 +16,9 @@ def memory():
     """Create a temporary memory manager for testing."""
     with tempfile.TemporaryDirectory() as tmpdir:
         db_path = os.path.join(tmpdir, "test_pm_agent.db")
-        yield MemoryManager(db_path)
+        manager = MemoryManager(db_path)
+        yield manager
+        manager.close()
 
 
 @pytest.fixture
@@ -74,6 +76,24 @@ class TestStaleTaskDetection:
         # Most items won't be a year old
         old_items = [s for s in stale if s['days_old'] > 365]
         assert len(old_items) == 0
+    
+    def test_sections_and_header_dates(self, engine):
+        """Test section typing, header lines and one item per line."""
+        context = (
+            "## 2. Active Epics [2020-01-01]\n"
+            "- Epic [2020-01-02] then [2020-01-03]\n"
+            "## 3. Reminders\n"
+            "- [2020-01-04 10:00] Ping design\n"
+            "- [2020-13-01] Bad date"
+        )
+        
+        stale = engine.check_stale_tasks(context, days_threshold=3)
+        
+        assert [(s['type'], s['date']) for s in stale] == [
+            ("stale_task", "2020-01-02"),
+            ("stale_reminder", "2020-01-04"),
+        ]
+        assert stale[1]['content'] == "- [2020-01-04 10:00] Ping design"
 
 
 class TestBlockerDetection:
@@ -123,6 +143,28 @@ class TestBlockerDetection:
         blockers = engine.detect_blockers(messages)
         
         assert len(blockers) == 0
+    
+    def test_mixed_case_context(self, engine):
+        """Test that mixed-case text matches and the context is cut from the original text."""
+        messages = [
+            {"text": "İstanbul office update: STUCK ON the vendor contract", "ts": "129a"}
+        ]
+        
+        blockers = engine.detect_blockers(messages)
+        
+        assert len(blockers) == 1
+        assert "STUCK ON the vendor" in blockers[0]["context"]
+    
+    def test_non_breaking_space(self, engine):
+        """Test that Unicode whitespace (as Slack sends it) matches with either regex engine."""
+        messages = [
+            {"text": "We're waiting\xa0on the legal review", "ts": "130a"},
+            {"text": "Still blocked\u2009by the API keys", "ts": "130b"},
+        ]
+        
+        blockers = engine.detect_blockers(messages)
+        
+        assert [b["timestamp"] for b in blockers] == ["130a", "130b"]
 
 
 class TestUrgencyDetection:
@@ -151,6 +193,16 @@ class TestUrgencyDetection:
         assert len(urgent) == 1
         assert urgent[0]["priority"] == "critical"
     
+    def test_overlapping_keywords(self, engine):
+        """Test that keywords sharing characters are all reported, in keyword order."""
+        messages = [
+            {"text": "Need this ASAP1 - Deadline is TODAY", "ts": "131a"}
+        ]
+        
+        urgent = engine.detect_urgency(messages)
+        
+        assert urgent[0]["keywords"] == ["asap", "deadline", "today", "p1"]
+    
     def test_no_urgency_in_normal_message(self, engine):
         """Test that normal messages aren't flagged as urgent."""
         messages = [
@@ -165,6 +217,13 @@ class TestUrgencyDetection:
 class TestStatusReport:
     """Tests for status report generation."""
     
+    def test_shared_client_manager(self, memory):
+        """Test that engines reuse a ClientManager passed in by the caller."""
+        manager = object()
+        
+        assert ProactiveEngine(memory, client_manager=manager).client_manager is manager
+        assert ProactiveEngine(memory, client_manager=manager).client_manager is manager
+    
     def test_generate_report(self, engine, sample_context):
         """Test basic report generation."""
         report = engine.generate_status_report(sample_context, period="weekly")
@@ -209,6 +268,16 @@ class TestProactiveSuggestions:
         blocker_suggestions = [s for s in suggestions if s["action_type"] == "proactive_blocker_alert"]
         assert len(blocker_suggestions) == 1
     
+    def test_recently_suggested_blocker_is_skipped(self, engine, memory, sample_context):
+        """Test that a blocker already decided on today is not suggested again."""
+        text = "We're blocked by the vendor response"
+        memory.log_decision("proactive_blocker_alert", False, "Seen",
+                            action_data={"original_content": text})
+        
+        suggestions = engine.get_proactive_suggestions(sample_context, [{"text": text, "ts": "142"}])
+        
+        assert not [s for s in suggestions if s["action_type"] == "proactive_blocker_alert"]
+    
     def test_suggestions_are_marked_proactive(self, engine, sample_context):
         """Test that all suggestions are marked as proactive."""
         messages = [{"text": "Waiting on approval", "ts": "141"}]
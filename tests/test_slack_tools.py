@@ -0,0 +1,72 @@
+import unittest
+from unittest.mock import MagicMock, patch
+import sys
+import os
+
+# Add parent directory to path to allow imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from slack_tools import _search_mentions
+
+PERMALINK = "https://team.slack.com/archives/C1/p{}"
+
+def _match(ts, user="U2", thread_ts=None):
+    permalink = PERMALINK.format(ts.replace(".", ""))
+    if thread_ts:
+        permalink += f"?thread_ts={thread_ts}&cid=C1"
+    return {"ts": ts, "text": "ping mohit", "user": user, "permalink": permalink,
+            "channel": {"id": "C1", "name": "general"}, "iid": "x", "team": "T1"}
+
+def _message(ts):
+    return {"type": "message", "ts": ts, "text": "ping mohit", "user": "U2",
+            "blocks": [], "reply_count": 2, "latest_reply": "200.0"}
+
+@patch.dict(os.environ, {"SLACK_USER_TOKEN": "xoxp-test"})
+class TestSearchMentions(unittest.TestCase):
+
+    def _search(self, matches, history, oldest=50.0, ignore_user_id=None):
+        user_client = MagicMock()
+        user_client.search_messages.return_value = {"messages": {"matches": matches}}
+        bot_client = MagicMock()
+        bot_client.conversations_history.return_value = {"messages": history, "has_more": False}
+        with patch('slack_tools._client_for_token', return_value=user_client), \
+             patch('slack_tools.get_slack_client', return_value=bot_client):
+            result = _search_mentions("C1", "U1", oldest, ["mohit"], ignore_user_id)
+        return result, bot_client
+
+    def test_thread_replies_are_skipped(self):
+        matches = [
+            _match("102.0"),
+            _match("101.0", thread_ts="100.0"),  # reply inside a thread
+            _match("100.0", thread_ts="100.0"),  # the thread parent itself
+        ]
+        history = [_message("102.0"), _message("100.5"), _message("100.0")]
+
+        result, bot_client = self._search(matches, history)
+
+        self.assertEqual([m["ts"] for m in result], ["102.0", "100.0"])
+        kwargs = bot_client.conversations_history.call_args.kwargs
+        self.assertEqual((kwargs["oldest"], kwargs["latest"]), ("100.0", "102.0"))
+
+    def test_oldest_cutoff(self):
+        matches = [_match("120.0"), _match("40.0")]
+
+        result, _ = self._search(matches, [_message("120.0")], oldest=50.0)
+
+        self.assertEqual([m["ts"] for m in result], ["120.0"])
+
+    def test_returns_history_message_shape(self):
+        result, _ = self._search([_match("120.0")], [_message("120.0")])
+
+        # Same dicts as the history scan, not trimmed search records
+        self.assertEqual(result, [_message("120.0")])
+
+    def test_no_hits_skips_history(self):
+        result, bot_client = self._search([_match("40.0"), _match("120.0", user="UBOT")], [],
+                                          ignore_user_id="UBOT")
+
+        self.assertEqual(result, [])
+        bot_client.conversations_history.assert_not_called()
+
+if __name__ == '__main__':
+    unittest.main()
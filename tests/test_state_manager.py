@@ -6,7 +6,7 @@ import os
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from state_manager import update_section
+from state_manager import update_section, _find_section
 
 class TestStateManager(unittest.TestCase):
 
@@ -61,5 +61,19 @@ class TestStateManager(unittest.TestCase):
             with self.assertRaises(ValueError):
                 update_section("1. Critical Status", "Content")
 
+    def test_find_section_empty_body_stops_at_next_header(self):
+        content = "## 1. Critical Status\n\n## 2. Release Plan\n- [ ] Alpha Release\n"
+        header_end, body_end = _find_section(content, "1. Critical Status")
+        
+        self.assertEqual(content[header_end:body_end], "")
+        self.assertTrue(content[body_end:].startswith("## 2. Release Plan"))
+
+    def test_find_section_ignores_subsections(self):
+        content = "### 1. Critical Status\nnested\n## 1. Critical Status\nbody\n### Notes\nmore\n## 2. Next\n"
+        header_end, body_end = _find_section(content, "1. Critical Status")
+        
+        self.assertEqual(content[header_end:body_end], "body\n### Notes\nmore")
+        self.assertEqual(content[body_end:], "\n## 2. Next\n")
+
 if __name__ == '__main__':
     unittest.main()